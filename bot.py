@@ -26,8 +26,16 @@ class QuizBot(commands.Bot):
         await self.load_extension("cogs.questions")
         await self.load_extension("cogs.stats")
         await self.load_extension("cogs.admin")
+        self._response_flusher = asyncio.create_task(db.response_flusher())
         LOGGER.info("Extensions loaded.")
 
+    async def close(self) -> None:
+        flusher = getattr(self, "_response_flusher", None)
+        if flusher:
+            flusher.cancel()
+        db.flush_responses()
+        await super().close()
+
     @staticmethod
     async def determine_prefix(bot: commands.Bot, message: discord.Message) -> str:
         # In the future this could be customised per guild.
@@ -4,7 +4,7 @@ from typing import Optional
 import discord
 from discord.ext import commands
 
-from services import db
+from services import charting, db
 from services.llm_client import LLMClient
 from pathlib import Path
 import json
@@ -72,6 +72,8 @@ class AdminCog(commands.Cog):
                 user.score = 0
                 user.correct = 0
                 user.wrong = 0
+        db.invalidate_score_caches()
+        charting.invalidate_leaderboard_cache()
         await ctx.reply("All scores have been reset.")
 
     @commands.hybrid_command(name="set_model", with_app_command=True, description="Set default LLM model for this server.")
@@ -174,6 +176,7 @@ class AdminCog(commands.Cog):
         with open(topics_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
+        LLMClient.reload_config()
         await ctx.reply(f"Added topic: {topic_name}")
 
     @commands.hybrid_command(name="remove_topic", with_app_command=True, description="Remove a quiz topic.")
@@ -216,6 +219,7 @@ class AdminCog(commands.Cog):
         with open(topics_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
+        LLMClient.reload_config()
         await ctx.reply(f"Removed topic: {topic_name}")
 
 
@@ -187,7 +187,6 @@ class QuestionCog(commands.Cog):
                 return channel
         return None
 
-    @staticmethod
     @staticmethod
     def _parse_prompt_metadata(prompt: str) -> Tuple[Dict[str, str], str]:
         meta: Dict[str, str] = {}
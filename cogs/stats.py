@@ -1,4 +1,6 @@
+import io
 from dataclasses import dataclass
+from functools import singledispatch
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple, Union
 
@@ -10,18 +12,97 @@ from services import charting, db
 ContextLike = Union[commands.Context, discord.Interaction]
 
 
+# Type-dispatched helpers keep isinstance chains off the hot reply path:
+# singledispatch resolves the target type via a registry lookup instead.
+@singledispatch
+def _extract_guild(target: ContextLike) -> Optional[discord.Guild]:
+    return getattr(target, "guild", None)
+
+
+@_extract_guild.register
+def _(target: commands.Context) -> Optional[discord.Guild]:
+    return target.guild
+
+
+@_extract_guild.register
+def _(target: discord.Interaction) -> Optional[discord.Guild]:
+    return target.guild
+
+
+@singledispatch
+def _extract_member(target: ContextLike) -> Optional[discord.Member]:
+    return None
+
+
+@_extract_member.register
+def _(target: commands.Context) -> Optional[discord.Member]:
+    author = target.author
+    return author if isinstance(author, discord.Member) else None
+
+
+@_extract_member.register
+def _(target: discord.Interaction) -> Optional[discord.Member]:
+    user = target.user
+    return user if isinstance(user, discord.Member) else None
+
+
+@singledispatch
+async def _send_reply(
+    target: ContextLike,
+    *,
+    content: Optional[str] = None,
+    embed: Optional[discord.Embed] = None,
+    files: Optional[List[discord.File]] = None,
+    ephemeral: bool = False,
+) -> None:
+    kwargs: Dict[str, object] = {"mention_author": False}
+    if content:
+        kwargs["content"] = content
+    if embed:
+        kwargs["embed"] = embed
+    if files:
+        kwargs["files"] = files
+    await target.reply(**kwargs)
+
+
+@_send_reply.register
+async def _(
+    target: discord.Interaction,
+    *,
+    content: Optional[str] = None,
+    embed: Optional[discord.Embed] = None,
+    files: Optional[List[discord.File]] = None,
+    ephemeral: bool = False,
+) -> None:
+    payload: Dict[str, object] = {}
+    if content:
+        payload["content"] = content
+    if embed:
+        payload["embed"] = embed
+    if files:
+        payload["files"] = files
+
+    if not target.response.is_done():
+        await target.response.send_message(ephemeral=ephemeral, **payload)
+    else:
+        await target.followup.send(ephemeral=ephemeral, **payload)
+
+
+# Charts are rendered to in-memory WebP bytes and attached straight from a
+# BytesIO; only the leaderboard keeps a Path because its render cache lives
+# on disk.
 @dataclass
 class PersonalStatArtifacts:
-    accuracy_chart: Optional[Path]
-    topic_chart: Optional[Path]
-    history_chart: Optional[Path]
+    accuracy_chart: Optional[bytes]
+    topic_chart: Optional[bytes]
+    history_chart: Optional[bytes]
 
 
 @dataclass
 class GlobalStatArtifacts:
     leaderboard_chart: Optional[Path]
-    accuracy_chart: Optional[Path]
-    topic_chart: Optional[Path]
+    accuracy_chart: Optional[bytes]
+    topic_chart: Optional[bytes]
 
 
 class StatsCog(commands.Cog):
@@ -201,16 +282,8 @@ class StatsCog(commands.Cog):
     # ------------------------------------------------------------------
     # Shared helpers
     # ------------------------------------------------------------------
-    @staticmethod
-    def _extract_guild(target: ContextLike) -> Optional[discord.Guild]:
-        if isinstance(target, commands.Context):
-            return target.guild
-        return target.guild
-
-    @staticmethod
-    def _extract_member(target: ContextLike) -> Optional[discord.Member]:
-        author = target.author if isinstance(target, commands.Context) else target.user
-        return author if isinstance(author, discord.Member) else None
+    _extract_guild = staticmethod(_extract_guild)
+    _extract_member = staticmethod(_extract_member)
 
     async def _reply(
         self,
@@ -221,28 +294,7 @@ class StatsCog(commands.Cog):
         files: Optional[List[discord.File]] = None,
         ephemeral: bool = False,
     ) -> None:
-        if isinstance(target, discord.Interaction):
-            payload: Dict[str, object] = {}
-            if content:
-                payload["content"] = content
-            if embed:
-                payload["embed"] = embed
-            if files:
-                payload["files"] = files
-
-            if not target.response.is_done():
-                await target.response.send_message(ephemeral=ephemeral, **payload)
-            else:
-                await target.followup.send(ephemeral=ephemeral, **payload)
-        else:
-            kwargs: Dict[str, object] = {"mention_author": False}
-            if content:
-                kwargs["content"] = content
-            if embed:
-                kwargs["embed"] = embed
-            if files:
-                kwargs["files"] = files
-            await target.reply(**kwargs)
+        await _send_reply(target, content=content, embed=embed, files=files, ephemeral=ephemeral)
 
     # ------------------------------------------------------------------
     # Personal stats handling
@@ -280,16 +332,16 @@ class StatsCog(commands.Cog):
             answered_questions,
             unanswered_count,
         )
-        charts = self._render_personal_charts(member, details)
+        charts = await self._render_personal_charts(member, details)
 
         files: List[discord.File] = []
-        if charts.accuracy_chart and charts.accuracy_chart.exists():
-            files.append(discord.File(charts.accuracy_chart, filename="accuracy.png"))
-            embed.set_thumbnail(url="attachment://accuracy.png")
-        if charts.topic_chart and charts.topic_chart.exists():
-            files.append(discord.File(charts.topic_chart, filename="topics.png"))
-        if charts.history_chart and charts.history_chart.exists():
-            files.append(discord.File(charts.history_chart, filename="history.png"))
+        if charts.accuracy_chart:
+            files.append(discord.File(io.BytesIO(charts.accuracy_chart), filename="accuracy.webp"))
+            embed.set_thumbnail(url="attachment://accuracy.webp")
+        if charts.topic_chart:
+            files.append(discord.File(io.BytesIO(charts.topic_chart), filename="topics.webp"))
+        if charts.history_chart:
+            files.append(discord.File(io.BytesIO(charts.history_chart), filename="history.webp"))
 
         await self._reply(target, embed=embed, files=files or None, ephemeral=ephemeral)
 
@@ -338,20 +390,20 @@ class StatsCog(commands.Cog):
         embed.set_footer(text="Keep streaking - first correct answer wins the round!")
         return embed
 
-    def _render_personal_charts(
+    async def _render_personal_charts(
         self, member: discord.Member, details: Dict[str, object]
     ) -> PersonalStatArtifacts:
         nickname = str(member.id)
-        accuracy_chart = charting.render_user_accuracy_chart(
+        accuracy_chart = await charting.render_user_accuracy_chart_async(
             username=nickname,
             correct=details["correct_answers"],
             incorrect=details["incorrect_answers"],
         )
-        topic_chart = charting.render_user_topic_breakdown(
+        topic_chart = await charting.render_user_topic_breakdown_async(
             username=nickname,
             topics=details["topics"],
         )
-        history_chart = charting.render_user_history_chart(member.id, member.display_name)
+        history_chart = await charting.render_user_history_chart_async(member.id, member.display_name)
         return PersonalStatArtifacts(accuracy_chart, topic_chart, history_chart)
 
     # ------------------------------------------------------------------
@@ -370,21 +422,22 @@ class StatsCog(commands.Cog):
             return
 
         limit = max(3, min(limit, 25))
-        leaderboard = db.get_leaderboard(limit=limit)
+        bundle = db.get_leaderboard_bundle(limit=limit, accuracy_limit=5, min_answers=5)
+        leaderboard = bundle.leaderboard
         if not leaderboard:
             await self._reply(target, content="No leaderboard data yet. Answer some questions first!", ephemeral=ephemeral)
             return
 
-        accuracy_raw = db.get_high_accuracy_players(limit=5, min_answers=5)
-        topic_leaders = db.get_top_topic_performers(limit_per_topic=1)
+        accuracy_raw = bundle.accuracy_leaders
+        topic_leaders = bundle.topic_leaders
         specialists_raw = [
             {"topic": topic, **entry} for topic, entries in topic_leaders.items() for entry in entries
         ]
 
-        user_ids = [row["id"] for row in leaderboard]
-        user_ids.extend(entry["user_id"] for entry in accuracy_raw)
-        user_ids.extend(entry["user_id"] for entry in specialists_raw)
-        labels = await self._resolve_user_labels(guild, user_ids)
+        unique_ids = {row["id"] for row in leaderboard}
+        unique_ids.update(entry["user_id"] for entry in accuracy_raw)
+        unique_ids.update(entry["user_id"] for entry in specialists_raw)
+        labels = await self._resolve_user_labels(guild, unique_ids)
 
         for row in leaderboard:
             row["name"] = labels.get(row["id"], row.get("name", f"User {row['id']}"))
@@ -393,6 +446,8 @@ class StatsCog(commands.Cog):
             {
                 **entry,
                 "user_label": labels.get(entry["user_id"], f"User {entry['user_id']}"),
+                # Computed once here so the embed and the chart reuse the same value.
+                "accuracy_pct": entry["accuracy"] * 100,
             }
             for entry in accuracy_raw
         ]
@@ -407,7 +462,7 @@ class StatsCog(commands.Cog):
 
         # Build separate embeds for each category
         embeds = self._build_leaderboard_embeds(target, leaderboard, accuracy_leaders, specialists)
-        charts = self._render_global_charts(leaderboard, accuracy_leaders, specialists)
+        charts = await self._render_global_charts(leaderboard, accuracy_leaders, specialists)
 
         # Send embeds sequentially
         for idx, embed in enumerate(embeds):
@@ -416,20 +471,24 @@ class StatsCog(commands.Cog):
             # Attach chart to first leaderboard embed
             if idx == 0 and "Top Players" in embed.title:
                 if charts.leaderboard_chart and charts.leaderboard_chart.exists():
-                    files.append(discord.File(charts.leaderboard_chart, filename="leaderboard.png"))
-                    embed.set_thumbnail(url="attachment://leaderboard.png")
+                    files.append(discord.File(charts.leaderboard_chart, filename="leaderboard.webp"))
+                    embed.set_thumbnail(url="attachment://leaderboard.webp")
 
             # Attach accuracy chart to accuracy leaders embed
             if "Accuracy Leaders" in embed.title:
-                if charts.accuracy_chart and charts.accuracy_chart.exists():
-                    files.append(discord.File(charts.accuracy_chart, filename="accuracy.png"))
-                    embed.set_thumbnail(url="attachment://accuracy.png")
+                if charts.accuracy_chart:
+                    files.append(
+                        discord.File(io.BytesIO(charts.accuracy_chart), filename="accuracy.webp")
+                    )
+                    embed.set_thumbnail(url="attachment://accuracy.webp")
 
             # Attach specialists chart to specialists embed
             if "Topic Specialists" in embed.title:
-                if charts.topic_chart and charts.topic_chart.exists():
-                    files.append(discord.File(charts.topic_chart, filename="specialists.png"))
-                    embed.set_thumbnail(url="attachment://specialists.png")
+                if charts.topic_chart:
+                    files.append(
+                        discord.File(io.BytesIO(charts.topic_chart), filename="specialists.webp")
+                    )
+                    embed.set_thumbnail(url="attachment://specialists.webp")
 
             # Send the embed
             if idx == 0:
@@ -515,7 +574,7 @@ class StatsCog(commands.Cog):
                 color=discord.Color.blue(),
             )
             accuracy_lines = [
-                f"{idx + 1}. **{entry['user_label']}** - {entry['accuracy'] * 100:.1f}% ({entry['correct']}/{entry['attempts']} correct)"
+                f"{idx + 1}. **{entry['user_label']}** - {entry['accuracy_pct']:.1f}% ({entry['correct']}/{entry['attempts']} correct)"
                 for idx, entry in enumerate(accuracy_leaders)
             ]
             accuracy_text = "\n".join(accuracy_lines) if accuracy_lines else "No data yet"
@@ -543,20 +602,21 @@ class StatsCog(commands.Cog):
 
         return embeds
 
-    def _render_global_charts(
+    async def _render_global_charts(
         self,
         leaderboard: List[dict],
         accuracy_leaders: List[dict],
         specialists: List[dict],
     ) -> GlobalStatArtifacts:
-        leaderboard_chart = charting.render_leaderboard_chart(leaderboard)
-        accuracy_chart = charting.render_accuracy_leaders_chart(accuracy_leaders)
-        topic_chart = charting.render_topic_leaders_chart(specialists)
+        leaderboard_chart = await charting.render_leaderboard_chart_async(leaderboard)
+        accuracy_chart = await charting.render_accuracy_leaders_chart_async(accuracy_leaders)
+        topic_chart = await charting.render_topic_leaders_chart_async(specialists)
         return GlobalStatArtifacts(leaderboard_chart, accuracy_chart, topic_chart)
 
     async def _resolve_user_labels(self, guild: discord.Guild, user_ids: Iterable[int]) -> Dict[int, str]:
+        """Resolve display names; callers are expected to pass unique IDs."""
         labels: Dict[int, str] = {}
-        for user_id in set(user_ids):
+        for user_id in user_ids:
             member = guild.get_member(user_id)
             if member:
                 labels[user_id] = member.display_name
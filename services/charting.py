@@ -1,15 +1,13 @@
+import asyncio
+import hashlib
+import io
 import logging
-from datetime import datetime
+import os
+import threading
+import time
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional
 
-import matplotlib
-
-matplotlib.use("Agg")
-import matplotlib.dates as mdates  # noqa: E402  (import after backend set)
-import matplotlib.pyplot as plt  # noqa: E402
-import numpy as np  # noqa: E402
-
 from services import db
 
 LOGGER = logging.getLogger(__name__)
@@ -17,75 +15,260 @@ LOGGER = logging.getLogger(__name__)
 CHARTS_DIR = Path("data") / "charts"
 CHARTS_DIR.mkdir(parents=True, exist_ok=True)
 
-plt.style.use("seaborn-v0_8")
+# Populated by _lazy_mpl() on the first render; importing matplotlib at module
+# level costs ~300ms and ~30MB even when no chart command is ever invoked.
+# pyplot is never imported: its Gcf figure registry is global, not
+# thread-safe, and every renderer here runs on asyncio.to_thread workers.
+mdates = None
+np = None
+_Figure = None
+_FigureCanvasAgg = None
+_Circle = None
+
+# Shared date-axis locator/formatter for the history chart, built once in
+# _lazy_mpl(); ConciseDateFormatter picks compact tick labels that need no
+# autofmt_xdate() rotation pass.
+_date_locator = None
+_date_formatter = None
+
+
+def _lazy_mpl() -> None:
+    """Import matplotlib/numpy on first use and configure the Agg backend."""
+    global mdates, np, _Figure, _FigureCanvasAgg, _Circle, _date_locator, _date_formatter
+    if np is not None:
+        return
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.dates as _mdates
+    import numpy as _np
+    from matplotlib import style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Circle
+
+    style.use("seaborn-v0_8")
+    mdates, np = _mdates, _np
+    _Figure, _FigureCanvasAgg, _Circle = Figure, FigureCanvasAgg, Circle
+    _date_locator = _mdates.AutoDateLocator()
+    _date_formatter = _mdates.ConciseDateFormatter(_date_locator)
+
+
+def _new_figure(figsize) -> "Figure":
+    """Build a figure directly, bypassing pyplot's global figure registry."""
+    fig = _Figure(figsize=figsize, layout="constrained")
+    _FigureCanvasAgg(fig)
+    return fig
+
+
+# Cache for the rendered leaderboard chart, keyed on the (name, score) pairs it
+# shows. record_response invalidates it whenever a score changes; the TTL is a
+# safety net in case an invalidation path is ever missed.
+_LEADERBOARD_CACHE_TTL = 60  # seconds
+_leaderboard_cache_key: Optional[str] = None
+_leaderboard_cache_path: Optional[Path] = None
+_leaderboard_cache_time: float = 0.0
+
+
+def invalidate_leaderboard_cache() -> None:
+    """Drop the cached leaderboard chart (call after any score change)."""
+    global _leaderboard_cache_key
+    _leaderboard_cache_key = None
 
 
-def _save_fig(fig: plt.Figure, filename: str) -> Path:
+# Explicit Pillow encoder settings: quality 85 is visually lossless for bar/pie
+# charts and method 4 keeps encode time low versus the slower default search.
+_SAVEFIG_PIL_KWARGS = {"quality": 85, "method": 4}
+
+
+def _save_fig(fig: "Figure", filename: str) -> Path:
     path = CHARTS_DIR / filename
-    fig.tight_layout()
-    fig.savefig(path, dpi=220, bbox_inches="tight")
-    plt.close(fig)
+    fig.savefig(path, dpi=110, pil_kwargs=_SAVEFIG_PIL_KWARGS)
     return path
 
 
+def _fig_to_bytes(fig: "Figure") -> bytes:
+    """Encode a figure to WebP in memory; Discord uploads need bytes, not files.
+
+    Figures are either reusable (held by the module) or unregistered
+    _new_figure instances reclaimed by GC, so nothing needs closing.
+    """
+    buf = io.BytesIO()
+    fig.savefig(buf, format="webp", dpi=110, pil_kwargs=_SAVEFIG_PIL_KWARGS)
+    return buf.getvalue()
+
+
+# Reusable Figure/Axes pairs for the most frequently rendered charts. Creating
+# and tearing down a fresh figure dominates the cost of small plots, so these
+# are built once and cleared per render; the locks serialise concurrent
+# command handlers drawing into the shared axes.
+_LB_LOCK = threading.Lock()
+_HIST_LOCK = threading.Lock()
+_lb_fig = None
+_lb_ax = None
+_hist_fig = None
+_hist_ax = None
+
+
+def _leaderboard_axes(height: float):
+    global _lb_fig, _lb_ax
+    if _lb_fig is None:
+        _lb_fig = _new_figure((7, height))
+        _lb_ax = _lb_fig.subplots()
+    else:
+        _lb_ax.clear()
+        _lb_fig.set_size_inches(7, height)
+    return _lb_fig, _lb_ax
+
+
+def _history_axes():
+    global _hist_fig, _hist_ax
+    if _hist_fig is None:
+        _hist_fig = _new_figure((7, 4))
+        _hist_ax = _hist_fig.subplots()
+    else:
+        _hist_ax.clear()
+    return _hist_fig, _hist_ax
+
+
+# The leaderboard is a plain bars-and-labels image, so drawing it directly
+# with Pillow skips matplotlib's Figure/Axes/renderer machinery entirely.
+# Set LEADERBOARD_CHART_BACKEND=matplotlib to force the Agg pipeline.
+LEADERBOARD_BACKEND = os.getenv("LEADERBOARD_CHART_BACKEND", "pil")
+
+
 def render_leaderboard_chart(leaderboard: List[dict]) -> Optional[Path]:
     """Render a horizontal bar chart for top users."""
     if not leaderboard:
         return None
 
+    global _leaderboard_cache_key, _leaderboard_cache_path, _leaderboard_cache_time
+    key = hashlib.blake2b(
+        repr([(entry["name"], entry["score"]) for entry in leaderboard]).encode()
+    ).hexdigest()
+    if (
+        key == _leaderboard_cache_key
+        and _leaderboard_cache_path is not None
+        and _leaderboard_cache_path.exists()
+        and time.time() - _leaderboard_cache_time < _LEADERBOARD_CACHE_TTL
+    ):
+        return _leaderboard_cache_path
+
+    path = None
+    if LEADERBOARD_BACKEND == "pil":
+        try:
+            path = render_leaderboard_chart_pil(leaderboard)
+        except ImportError:
+            LOGGER.warning("Pillow unavailable, falling back to matplotlib for leaderboard chart.")
+    if path is None:
+        path = _render_leaderboard_chart_mpl(leaderboard)
+
+    _leaderboard_cache_key = key
+    _leaderboard_cache_path = path
+    _leaderboard_cache_time = time.time()
+    return path
+
+
+def render_leaderboard_chart_pil(leaderboard: List[dict]) -> Path:
+    """Draw the leaderboard bars directly with Pillow (no matplotlib)."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    width = 1200
+    row_height = 60
+    top_margin = 80
+    label_width = 280
+    bar_span = width - label_width - 140
+
+    bar_fill = (71, 118, 230)  # matches the matplotlib palette
+    bar_edge = (30, 60, 114)
+    text_fill = (25, 25, 25)
+
+    max_score = max(entry["score"] for entry in leaderboard) or 1
+
+    img = Image.new("RGB", (width, top_margin + row_height * len(leaderboard) + 20), "white")
+    draw = ImageDraw.Draw(img)
+    try:
+        title_font = ImageFont.load_default(size=28)
+        body_font = ImageFont.load_default(size=20)
+    except TypeError:  # Pillow < 10.1 has no size argument
+        title_font = body_font = ImageFont.load_default()
+
+    draw.text((20, 24), "Global Leaderboard", fill=text_fill, font=title_font)
+
+    for idx, entry in enumerate(leaderboard):
+        y = top_margin + idx * row_height
+        bar_length = int(bar_span * entry["score"] / max_score)
+        draw.text((20, y + 18), str(entry["name"])[:32], fill=text_fill, font=body_font)
+        draw.rectangle(
+            [label_width, y + 12, label_width + bar_length, y + row_height - 12],
+            fill=bar_fill,
+            outline=bar_edge,
+        )
+        draw.text(
+            (label_width + bar_length + 10, y + 18),
+            str(entry["score"]),
+            fill=text_fill,
+            font=body_font,
+        )
+
+    path = CHARTS_DIR / "leaderboard.webp"
+    img.save(path, **_SAVEFIG_PIL_KWARGS)
+    return path
+
+
+def _render_leaderboard_chart_mpl(leaderboard: List[dict]) -> Path:
+    _lazy_mpl()
     names = [entry["name"] for entry in leaderboard]
     scores = [entry["score"] for entry in leaderboard]
     positions = np.arange(len(names))
 
-    fig, ax = plt.subplots(figsize=(7, 0.65 * len(names) + 1.5))
-    bars = ax.barh(positions, scores, color="#4776E6", edgecolor="#1E3C72")
-    ax.set_yticks(positions)
-    ax.set_yticklabels(names, fontsize=11)
-    ax.invert_yaxis()
-    ax.set_xlabel("Score", fontsize=11)
-    ax.set_title("Global Leaderboard", fontsize=14, weight="bold")
-    ax.grid(axis="x", linestyle="--", alpha=0.3)
+    with _LB_LOCK:
+        fig, ax = _leaderboard_axes(0.65 * len(names) + 1.5)
+        bars = ax.barh(positions, scores, color="#4776E6", edgecolor="#1E3C72")
+        ax.set_yticks(positions)
+        ax.set_yticklabels(names, fontsize=11)
+        ax.invert_yaxis()
+        ax.set_xlabel("Score", fontsize=11)
+        ax.set_title("Global Leaderboard", fontsize=14, weight="bold")
+        ax.grid(axis="x", linestyle="--", alpha=0.3)
 
-    for bar, value in zip(bars, scores):
-        ax.text(bar.get_width() + 1, bar.get_y() + bar.get_height() / 2, str(value), va="center", fontsize=10)
+        ax.bar_label(bars, labels=[str(value) for value in scores], padding=3, fontsize=10)
 
-    return _save_fig(fig, "leaderboard.png")
+        return _save_fig(fig, "leaderboard.webp")
 
 
-def render_user_history_chart(user_id: int, username: str) -> Optional[Path]:
+def render_user_history_chart(user_id: int, username: str) -> Optional[bytes]:
     """Render a cumulative score chart for an individual user."""
-    history = db.iter_user_history(user_id)
-    if not history:
+    dates, correct = db.iter_user_history_points(user_id)
+    if not dates:
         return None
 
-    dates: List[datetime] = []
-    cumulative_scores: List[int] = []
-    score = 0
-    for response in reversed(history):  # chronological order
-        if response.is_correct:
-            score += 10
-        dates.append(response.answered_at)
-        cumulative_scores.append(score)
-
-    fig, ax = plt.subplots(figsize=(7, 4))
-    ax.plot(dates, cumulative_scores, marker="o", color="#00B09B", linewidth=2)
-    ax.fill_between(dates, cumulative_scores, color="#00B09B", alpha=0.15)
-    ax.set_title(f"Performance Trend - {username}", fontsize=14, weight="bold")
-    ax.set_xlabel("Date", fontsize=11)
-    ax.set_ylabel("Cumulative Score", fontsize=11)
-    ax.grid(True, which="both", axis="y", linestyle="--", linewidth=0.6, alpha=0.4)
-    ax.xaxis.set_major_formatter(mdates.DateFormatter("%b %d"))
-    fig.autofmt_xdate()
-
-    return _save_fig(fig, f"user_{user_id}_history.png")
-
-
-def render_user_accuracy_chart(username: str, correct: int, incorrect: int) -> Optional[Path]:
+    _lazy_mpl()
+    cumulative_scores = np.cumsum(np.asarray(correct, dtype=np.int32)) * 10
+
+    with _HIST_LOCK:
+        fig, ax = _history_axes()
+        ax.plot(dates, cumulative_scores, marker="o", color="#00B09B", linewidth=2)
+        ax.fill_between(dates, cumulative_scores, color="#00B09B", alpha=0.15)
+        ax.set_title(f"Performance Trend - {username}", fontsize=14, weight="bold")
+        ax.set_xlabel("Date", fontsize=11)
+        ax.set_ylabel("Cumulative Score", fontsize=11)
+        ax.grid(True, which="both", axis="y", linestyle="--", linewidth=0.6, alpha=0.4)
+        ax.xaxis.set_major_locator(_date_locator)
+        ax.xaxis.set_major_formatter(_date_formatter)
+
+        return _fig_to_bytes(fig)
+
+
+def render_user_accuracy_chart(username: str, correct: int, incorrect: int) -> Optional[bytes]:
     total = correct + incorrect
     if total == 0:
         return None
 
-    fig, ax = plt.subplots(figsize=(4, 4))
+    _lazy_mpl()
+    fig = _new_figure((4, 4))
+    ax = fig.subplots()
     _wedges, _labels, _autotexts = ax.pie(
         [correct, incorrect],
         labels=["Correct", "Incorrect"],
@@ -95,25 +278,27 @@ def render_user_accuracy_chart(username: str, correct: int, incorrect: int) -> O
         wedgeprops={"linewidth": 1.5, "edgecolor": "white"},
     )
     ax.set_title(f"Answer Accuracy - {username}", fontsize=12, weight="bold")
-    centre_circle = plt.Circle((0, 0), 0.60, fc="white")
-    fig.gca().add_artist(centre_circle)
+    centre_circle = _Circle((0, 0), 0.60, fc="white")
+    ax.add_artist(centre_circle)
     ax.text(0, 0, f"{(correct/total)*100:.1f}%", ha="center", va="center", fontsize=14, weight="bold")
 
-    return _save_fig(fig, f"user_{username}_accuracy.png")
+    return _fig_to_bytes(fig)
 
 
-def render_user_topic_breakdown(username: str, topics: Iterable[Dict[str, object]]) -> Optional[Path]:
+def render_user_topic_breakdown(username: str, topics: Iterable[Dict[str, object]]) -> Optional[bytes]:
     topics_list = list(topics)
     if not topics_list:
         return None
 
+    _lazy_mpl()
     topics_list.sort(key=lambda item: item.get("attempts", 0), reverse=True)
     labels = [item["topic"] for item in topics_list]
     correct_values = np.array([item.get("correct", 0) for item in topics_list], dtype=float)
     incorrect_values = np.array([item.get("attempts", 0) - item.get("correct", 0) for item in topics_list], dtype=float)
     positions = np.arange(len(labels))
 
-    fig, ax = plt.subplots(figsize=(7, 0.5 * len(labels) + 2))
+    fig = _new_figure((7, 0.5 * len(labels) + 2))
+    ax = fig.subplots()
     ax.barh(positions, correct_values, color="#4CAF50", label="Correct")
     ax.barh(positions, incorrect_values, left=correct_values, color="#E57373", label="Incorrect", alpha=0.8)
 
@@ -134,19 +319,21 @@ def render_user_topic_breakdown(username: str, topics: Iterable[Dict[str, object
             fontsize=9,
         )
 
-    return _save_fig(fig, f"user_{username}_topics.png")
+    return _fig_to_bytes(fig)
 
 
-def render_accuracy_leaders_chart(entries: List[Dict[str, object]]) -> Optional[Path]:
+def render_accuracy_leaders_chart(entries: List[Dict[str, object]]) -> Optional[bytes]:
     if not entries:
         return None
 
+    _lazy_mpl()
     labels = [entry["user_label"] for entry in entries]
-    accuracy = [entry["accuracy"] * 100 for entry in entries]
+    accuracy = [entry.get("accuracy_pct", entry["accuracy"] * 100) for entry in entries]
     attempts = [entry["attempts"] for entry in entries]
     positions = np.arange(len(labels))
 
-    fig, ax = plt.subplots(figsize=(7, 0.55 * len(labels) + 2))
+    fig = _new_figure((7, 0.55 * len(labels) + 2))
+    ax = fig.subplots()
     bars = ax.barh(positions, accuracy, color="#FFB347")
     ax.set_yticks(positions)
     ax.set_yticklabels(labels, fontsize=10)
@@ -165,19 +352,21 @@ def render_accuracy_leaders_chart(entries: List[Dict[str, object]]) -> Optional[
             fontsize=9,
         )
 
-    return _save_fig(fig, "accuracy_leaders.png")
+    return _fig_to_bytes(fig)
 
 
-def render_topic_leaders_chart(entries: List[Dict[str, object]]) -> Optional[Path]:
+def render_topic_leaders_chart(entries: List[Dict[str, object]]) -> Optional[bytes]:
     if not entries:
         return None
 
+    _lazy_mpl()
     topics = [entry["topic"] for entry in entries]
     scores = [entry["correct"] for entry in entries]
     labels = [entry["user_label"] for entry in entries]
     positions = np.arange(len(topics))
 
-    fig, ax = plt.subplots(figsize=(7, 0.6 * len(topics) + 2))
+    fig = _new_figure((7, 0.6 * len(topics) + 2))
+    ax = fig.subplots()
     bars = ax.barh(positions, scores, color="#8E54E9")
     ax.set_yticks(positions)
     ax.set_yticklabels(topics, fontsize=10)
@@ -194,4 +383,32 @@ def render_topic_leaders_chart(entries: List[Dict[str, object]]) -> Optional[Pat
             fontsize=9,
         )
 
-    return _save_fig(fig, "topic_leaders.png")
+    return _fig_to_bytes(fig)
+
+
+# Async wrappers: savefig is synchronous CPU + blocking I/O, so rendering
+# directly inside a command coroutine would stall the event loop. Callers in
+# the cogs await these instead; the per-figure locks above keep concurrent
+# renders safe.
+async def render_leaderboard_chart_async(leaderboard: List[dict]) -> Optional[Path]:
+    return await asyncio.to_thread(render_leaderboard_chart, leaderboard)
+
+
+async def render_user_history_chart_async(user_id: int, username: str) -> Optional[bytes]:
+    return await asyncio.to_thread(render_user_history_chart, user_id, username)
+
+
+async def render_user_accuracy_chart_async(username: str, correct: int, incorrect: int) -> Optional[bytes]:
+    return await asyncio.to_thread(render_user_accuracy_chart, username, correct, incorrect)
+
+
+async def render_user_topic_breakdown_async(username: str, topics: Iterable[Dict[str, object]]) -> Optional[bytes]:
+    return await asyncio.to_thread(render_user_topic_breakdown, username, topics)
+
+
+async def render_accuracy_leaders_chart_async(entries: List[Dict[str, object]]) -> Optional[bytes]:
+    return await asyncio.to_thread(render_accuracy_leaders_chart, entries)
+
+
+async def render_topic_leaders_chart_async(entries: List[Dict[str, object]]) -> Optional[bytes]:
+    return await asyncio.to_thread(render_topic_leaders_chart, entries)
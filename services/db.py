@@ -1,22 +1,32 @@
+import asyncio
 import logging
 import os
+import threading
 from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
+from cachetools import TTLCache
+from sortedcontainers import SortedList
 from sqlalchemy import (
     JSON,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     create_engine,
+    event,
     func,
+    select,
     text,
+    update,
 )
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import declarative_base, relationship, scoped_session, sessionmaker
@@ -25,6 +35,25 @@ LOGGER = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+# Precompiled attribute pluckers for the to_dict methods below: one
+# attrgetter call per row instead of a chain of instrumented lookups.
+_USER_KEYS = ("id", "name", "score", "correct", "wrong")
+_USER_GET = attrgetter(*_USER_KEYS)
+_QUESTION_KEYS = (
+    "id",
+    "message_id",
+    "channel_id",
+    "topic",
+    "prompt",
+    "options",
+    "correct_answer",
+    "explanation",
+    "answered_count",
+)
+_QUESTION_GET = attrgetter(*_QUESTION_KEYS)
+_RESPONSE_KEYS = ("id", "question_id", "user_id", "answer", "is_correct")
+_RESPONSE_GET = attrgetter(*_RESPONSE_KEYS)
+
 
 def _resolve_database_url() -> str:
     """Return the database URL, defaulting to a local SQLite file."""
@@ -37,16 +66,168 @@ def _resolve_database_url() -> str:
     return f"sqlite:///{data_dir / 'questions.db'}"
 
 
+_DATABASE_URL = _resolve_database_url()
+
+# SQLite sessions run on both the event loop and chart-render worker
+# threads, so each checkout needs its own connection (the default pool);
+# sharing one connection would interleave transactions across threads.
+# WAL keeps the concurrent readers cheap.
+_ENGINE_KWARGS = (
+    {"connect_args": {"check_same_thread": False}}
+    if "sqlite" in _DATABASE_URL
+    else {}
+)
+
 ENGINE = create_engine(
-    _resolve_database_url(),
+    _DATABASE_URL,
     echo=False,
     future=True,
-    connect_args={"check_same_thread": False} if "sqlite" in _resolve_database_url() else {},
+    **_ENGINE_KWARGS,
 )
+if ENGINE.dialect.name == "sqlite":
+
+    @event.listens_for(ENGINE, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Tune SQLite for concurrent bot traffic on every new connection.
+
+        WAL lets readers proceed during writes; synchronous=NORMAL is safe
+        with WAL and skips an fsync per transaction.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA mmap_size=134217728")
+        cursor.close()
+
+
 SESSION_FACTORY = scoped_session(
     sessionmaker(bind=ENGINE, autoflush=False, autocommit=False, expire_on_commit=False)
 )
 
+# Short-lived caches for the read paths hit on every command. Write paths
+# below invalidate the affected entries, the TTL is only a safety net.
+_USER_STATS_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=30)
+_GUILD_CONFIG_CACHE: TTLCache = TTLCache(maxsize=256, ttl=300)
+
+# In-memory leaderboard: a SortedList of (score, correct, user_id, name, wrong)
+# tuples warmed from one query, then maintained incrementally on every answer.
+# Top-N reads become a slice instead of an ORDER BY ... LIMIT scan.
+_LB_LOCK = threading.Lock()
+_LB: Optional[SortedList] = None
+_LB_ENTRIES: Dict[int, tuple] = {}
+
+
+def _ensure_leaderboard_warm() -> None:
+    """Build the in-memory leaderboard from a single warmup query."""
+    global _LB
+    if _LB is not None:
+        return
+    try:
+        with get_session() as session:
+            rows = session.execute(
+                select(User.score, User.correct, User.id, User.name, User.wrong)
+            ).all()
+    except SQLAlchemyError:
+        return
+    with _LB_LOCK:
+        if _LB is None:
+            entries = [tuple(row) for row in rows]
+            _LB = SortedList(entries)
+            _LB_ENTRIES.clear()
+            _LB_ENTRIES.update({entry[2]: entry for entry in entries})
+
+
+def _bump_leaderboard_entry(user_id: int, name: str, points: int, is_correct: bool) -> None:
+    """Incrementally update a user's in-memory leaderboard entry for one answer."""
+    with _LB_LOCK:
+        if _LB is None:
+            return
+        old = _LB_ENTRIES.get(user_id)
+        if old is None:
+            entry = (points, 1 if is_correct else 0, user_id, name, 0 if is_correct else 1)
+        else:
+            _LB.remove(old)
+            entry = (
+                old[0] + points,
+                old[1] + (1 if is_correct else 0),
+                user_id,
+                name,
+                old[4] + (0 if is_correct else 1),
+            )
+        _LB.add(entry)
+        _LB_ENTRIES[user_id] = entry
+
+
+def _sync_leaderboard_entry(user: "User") -> None:
+    """Replace a user's in-memory leaderboard entry with fresh row values."""
+    with _LB_LOCK:
+        if _LB is None:
+            return
+        old = _LB_ENTRIES.get(user.id)
+        entry = (user.score, user.correct, user.id, user.name, user.wrong)
+        if old == entry:
+            return
+        if old is not None:
+            _LB.remove(old)
+        _LB.add(entry)
+        _LB_ENTRIES[user.id] = entry
+
+
+# Buffered response rows: record_response appends here and a background
+# task bulk-inserts them, amortising the per-answer commit/fsync cost.
+_RESPONSE_BUF: List[dict] = []
+_RESP_LOCK = threading.Lock()
+_RESPONSE_FLUSH_INTERVAL = 0.25
+_RESPONSE_FLUSH_BATCH = 50
+
+
+def flush_responses() -> None:
+    """Write all buffered response rows in a single bulk insert.
+
+    On failure the batch is put back at the front of the buffer so the
+    rows are retried on the next flush instead of being lost.
+    """
+    with _RESP_LOCK:
+        if not _RESPONSE_BUF:
+            return
+        batch = list(_RESPONSE_BUF)
+        _RESPONSE_BUF.clear()
+    try:
+        with get_session() as session:
+            session.bulk_insert_mappings(Response, batch)
+    except BaseException:
+        with _RESP_LOCK:
+            _RESPONSE_BUF[:0] = batch
+        raise
+
+
+async def response_flusher() -> None:
+    """Flush buffered responses on a short timer; run as a background task."""
+    while True:
+        await asyncio.sleep(_RESPONSE_FLUSH_INTERVAL)
+        try:
+            flush_responses()
+        except Exception:
+            LOGGER.exception("Buffered response flush failed; will retry")
+
+
+def invalidate_score_caches(user_id: Optional[int] = None) -> None:
+    """Drop cached user-stat entries after a score change.
+
+    With no ``user_id`` (e.g. an admin score reset) the in-memory
+    leaderboard is also discarded and rebuilt on the next read.
+    """
+    global _LB
+    if user_id is None:
+        _USER_STATS_CACHE.clear()
+        with _LB_LOCK:
+            _LB = None
+            _LB_ENTRIES.clear()
+    else:
+        _USER_STATS_CACHE.pop(user_id, None)
+
 
 class User(Base):
     __tablename__ = "users"
@@ -61,18 +242,16 @@ class User(Base):
     responses = relationship("Response", back_populates="user", cascade="all, delete-orphan")
 
     def to_dict(self) -> Dict[str, Optional[str]]:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "score": self.score,
-            "correct": self.correct,
-            "wrong": self.wrong,
-            "last_answer_time": self.last_answer_time.isoformat() if self.last_answer_time else None,
-        }
+        data = dict(zip(_USER_KEYS, _USER_GET(self)))
+        data["last_answer_time"] = (
+            self.last_answer_time.isoformat() if self.last_answer_time else None
+        )
+        return data
 
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (Index("ix_questions_channel_created", "channel_id", "created_at"),)
 
     id = Column(Integer, primary_key=True)
     message_id = Column(Integer, nullable=True)  # Discord message that announced the question
@@ -89,24 +268,21 @@ class Question(Base):
     responses = relationship("Response", back_populates="question", cascade="all, delete-orphan")
 
     def to_dict(self) -> Dict[str, Optional[str]]:
-        return {
-            "id": self.id,
-            "message_id": self.message_id,
-            "channel_id": self.channel_id,
-            "topic": self.topic,
-            "prompt": self.prompt,
-            "options": self.options,
-            "correct_answer": self.correct_answer,
-            "explanation": self.explanation,
-            "created_at": self.created_at.isoformat(),
-            "answered_count": self.answered_count,
-            "last_fetched_at": self.last_fetched_at.isoformat() if self.last_fetched_at else None,
-        }
+        data = dict(zip(_QUESTION_KEYS, _QUESTION_GET(self)))
+        data["created_at"] = self.created_at.isoformat()
+        data["last_fetched_at"] = (
+            self.last_fetched_at.isoformat() if self.last_fetched_at else None
+        )
+        return data
 
 
 class Response(Base):
     __tablename__ = "responses"
-    __table_args__ = (UniqueConstraint("question_id", "user_id", name="uq_question_user"),)
+    __table_args__ = (
+        UniqueConstraint("question_id", "user_id", name="uq_question_user"),
+        Index("ix_responses_user_answered", "user_id", "answered_at"),
+        Index("ix_responses_question_correct_answered", "question_id", "is_correct", "answered_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
@@ -119,14 +295,9 @@ class Response(Base):
     question = relationship("Question", back_populates="responses")
 
     def to_dict(self) -> Dict[str, Optional[str]]:
-        return {
-            "id": self.id,
-            "question_id": self.question_id,
-            "user_id": self.user_id,
-            "answer": self.answer,
-            "is_correct": self.is_correct,
-            "answered_at": self.answered_at.isoformat(),
-        }
+        data = dict(zip(_RESPONSE_KEYS, _RESPONSE_GET(self)))
+        data["answered_at"] = self.answered_at.isoformat()
+        return data
 
 
 class GuildConfig(Base):
@@ -152,14 +323,15 @@ def init_db() -> None:
     _ensure_answered_count_column()
     _ensure_guild_default_model_column()
     _ensure_last_fetched_at_column()
+    _ensure_response_indexes()
     _backfill_answered_count()
     _backfill_last_fetched_at()
-    LOGGER.info("Database initialised at %s", _resolve_database_url())
+    LOGGER.info("Database initialised at %s", _DATABASE_URL)
 
 
 def _ensure_answered_count_column() -> None:
     """Add answered_count column to questions table if missing (SQLite migration)."""
-    if "sqlite" not in _resolve_database_url():
+    if "sqlite" not in _DATABASE_URL:
         return
 
     try:
@@ -179,7 +351,7 @@ def _ensure_answered_count_column() -> None:
 
 def _ensure_guild_default_model_column() -> None:
     """Add default_model column to guild_config table if missing (SQLite migration)."""
-    if "sqlite" not in _resolve_database_url():
+    if "sqlite" not in _DATABASE_URL:
         return
 
     try:
@@ -199,7 +371,7 @@ def _ensure_guild_default_model_column() -> None:
 
 def _ensure_last_fetched_at_column() -> None:
     """Add last_fetched_at column to questions table if missing (SQLite migration)."""
-    if "sqlite" not in _resolve_database_url():
+    if "sqlite" not in _DATABASE_URL:
         return
 
     try:
@@ -217,6 +389,33 @@ def _ensure_last_fetched_at_column() -> None:
         LOGGER.warning("Could not add last_fetched_at column: %s", exc)
 
 
+def _ensure_response_indexes() -> None:
+    """Create indexes on existing databases (create_all only covers new tables)."""
+    try:
+        with ENGINE.connect() as connection:
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_responses_user_answered "
+                    "ON responses (user_id, answered_at)"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_responses_question_correct_answered "
+                    "ON responses (question_id, is_correct, answered_at)"
+                )
+            )
+            connection.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_questions_channel_created "
+                    "ON questions (channel_id, created_at)"
+                )
+            )
+            connection.commit()
+    except SQLAlchemyError as exc:
+        LOGGER.warning("Could not create response indexes: %s", exc)
+
+
 def _backfill_answered_count() -> None:
     """Populate answered_count from response rows (safe to run repeatedly)."""
     try:
@@ -268,18 +467,15 @@ def upsert_user(user_id: int, name: str) -> User:
         if user:
             if user.name != name:
                 user.name = name
-            session.add(user)
-            session.flush()
-            session.refresh(user)
-            session.expunge(user)
-            return user
-
-        user = User(id=user_id, name=name)
+        else:
+            user = User(id=user_id, name=name)
         session.add(user)
         session.flush()
         session.refresh(user)
         session.expunge(user)
-        return user
+    _sync_leaderboard_entry(user)
+    invalidate_score_caches(user_id)
+    return user
 
 
 def record_question(
@@ -327,53 +523,134 @@ def record_response(
     answer: str,
     is_correct: bool,
     difficulty: Optional[str] = None,
-) -> Response:
-    """Record a user response and update their stats atomically."""
+) -> Dict[str, object]:
+    """Record a user response and update their stats atomically.
+
+    Stat deltas are computed in Python and applied with a single UPDATE
+    rather than loading the User row, mutating it, and letting the ORM
+    diff it on commit.
+    """
+    now = datetime.utcnow()
+    points = 0
+    if is_correct:
+        score_map = {"Easy": 5, "Medium": 10, "Hard": 20}
+        points = score_map.get((difficulty or "").title(), 10)
+
     with get_session() as session:
-        question = session.get(Question, question_id)
-        user = session.get(User, user_id)
-        if not user:
-            user = User(id=user_id, name=username)
-            session.add(user)
-            session.flush()
+        session.execute(
+            update(Question)
+            .where(Question.id == question_id)
+            .values(answered_count=Question.answered_count + 1)
+        )
 
-        user.last_answer_time = datetime.utcnow()
-        user.name = username
-        if is_correct:
-            score_map = {"Easy": 5, "Medium": 10, "Hard": 20}
-            points = score_map.get((difficulty or "").title(), 10)
-            user.score += points
-            user.correct += 1
-        else:
-            user.wrong += 1
+        updated = session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                name=username,
+                last_answer_time=now,
+                score=User.score + points,
+                correct=User.correct + (1 if is_correct else 0),
+                wrong=User.wrong + (0 if is_correct else 1),
+            )
+        ).rowcount
+        if not updated:
+            session.add(
+                User(
+                    id=user_id,
+                    name=username,
+                    score=points,
+                    correct=1 if is_correct else 0,
+                    wrong=0 if is_correct else 1,
+                    last_answer_time=now,
+                )
+            )
 
-        if question:
-            question.answered_count += 1
+    row = {
+        "question_id": question_id,
+        "user_id": user_id,
+        "answer": answer,
+        "is_correct": 1 if is_correct else 0,
+        "answered_at": now,
+    }
+    with _RESP_LOCK:
+        _RESPONSE_BUF.append(row)
+        pending = len(_RESPONSE_BUF)
+    if pending >= _RESPONSE_FLUSH_BATCH:
+        flush_responses()
+
+    _bump_leaderboard_entry(user_id, username, points, is_correct)
+    invalidate_score_caches(user_id)
+    _invalidate_leaderboard_chart()
+    return dict(row)
+
+
+def _invalidate_leaderboard_chart() -> None:
+    """Drop the cached leaderboard chart after a score change.
+
+    Imported lazily to avoid a circular import (charting imports this module).
+    """
+    from services import charting
+
+    charting.invalidate_leaderboard_cache()
 
-        response = Response(
-            question_id=question_id,
-            user_id=user_id,
-            answer=answer,
-            is_correct=1 if is_correct else 0,
-        )
-        session.add(response)
-        session.flush()
-        session.refresh(response)
-        session.expunge(response)
-        return response
+
+@dataclass
+class LeaderboardBundle:
+    """All leaderboard-related query results, fetched in one session."""
+
+    leaderboard: List[Dict[str, Optional[str]]]
+    accuracy_leaders: List[Dict[str, object]]
+    topic_leaders: Dict[str, list]
+
+
+def _query_leaderboard(session, limit: int) -> List[Dict[str, Optional[str]]]:
+    users = session.query(User).order_by(User.score.desc(), User.correct.desc()).limit(limit).all()
+    return [user.to_dict() for user in users]
 
 
 def get_leaderboard(limit: int = 10) -> List[Dict[str, Optional[str]]]:
-    """Return the top users by score."""
+    """Return the top users by score from the in-memory leaderboard."""
+    _ensure_leaderboard_warm()
+    if _LB is None:
+        with get_session() as session:
+            return _query_leaderboard(session, limit)
+    with _LB_LOCK:
+        top = list(reversed(_LB[-limit:]))
+    return [
+        {"id": user_id, "name": name, "score": score, "correct": correct, "wrong": wrong}
+        for score, correct, user_id, name, wrong in top
+    ]
+
+
+def get_leaderboard_bundle(
+    limit: int = 10, accuracy_limit: int = 5, min_answers: int = 5
+) -> LeaderboardBundle:
+    """Fetch the leaderboard, accuracy leaders, and topic leaders in one session.
+
+    Issuing the three queries inside a single transactional scope avoids the
+    connection/commit overhead of three separate calls.
+    """
+    flush_responses()
+    leaderboard = get_leaderboard(limit)
     with get_session() as session:
-        users = session.query(User).order_by(User.score.desc(), User.correct.desc()).limit(limit).all()
-        return [user.to_dict() for user in users]
+        return LeaderboardBundle(
+            leaderboard=leaderboard,
+            accuracy_leaders=_query_high_accuracy_players(session, accuracy_limit, min_answers),
+            topic_leaders=_query_top_topic_performers(session, 1),
+        )
 
 
 def get_user_stats(user_id: int) -> Optional[Dict[str, Optional[str]]]:
+    cached = _USER_STATS_CACHE.get(user_id)
+    if cached is not None:
+        return cached
     with get_session() as session:
         user = session.get(User, user_id)
-        return user.to_dict() if user else None
+        result = user.to_dict() if user else None
+    if result is not None:
+        _USER_STATS_CACHE[user_id] = result
+    return result
 
 
 def fetch_recent_questions(limit: int = 20) -> List[Dict[str, Optional[str]]]:
@@ -475,6 +752,7 @@ def get_latest_question_for_channel(channel_id: int) -> Optional[Question]:
 
 
 def get_question_and_responses(question_id: int) -> Tuple[Optional[Question], List[Response]]:
+    flush_responses()
     with get_session() as session:
         question = session.get(Question, question_id)
         if not question:
@@ -491,53 +769,81 @@ def get_question_and_responses(question_id: int) -> Tuple[Optional[Question], Li
         return question, responses
 
 
-def iter_user_history(user_id: int) -> Iterable[Response]:
+def iter_user_history_points(user_id: int, limit: int = 1000) -> Tuple[List[datetime], List[int]]:
+    """Return parallel (answered_at, is_correct) lists in chronological order.
+
+    Column-only query for vectorised chart prep, capped at the most recent
+    ``limit`` responses so very active players do not pull their entire
+    history into memory.
+    """
+    flush_responses()
     with get_session() as session:
-        responses = (
-            session.query(Response)
-            .filter(Response.user_id == user_id)
+        rows = session.execute(
+            select(Response.answered_at, Response.is_correct)
+            .where(Response.user_id == user_id)
             .order_by(Response.answered_at.desc())
-            .all()
-        )
-        for response in responses:
-            session.expunge(response)
-        return list(responses)
+            .limit(limit)
+        ).all()
+    if not rows:
+        return [], []
+    rows.reverse()
+    dates, correct = zip(*rows)
+    return list(dates), list(correct)
 
 
 def has_user_answered(question_id: int, user_id: int) -> bool:
+    with _RESP_LOCK:
+        for row in _RESPONSE_BUF:
+            if row["question_id"] == question_id and row["user_id"] == user_id:
+                return True
     with get_session() as session:
-        result = (
-            session.query(Response)
-            .filter(Response.question_id == question_id, Response.user_id == user_id)
-            .first()
-        )
+        result = session.execute(
+            select(1)
+            .where(Response.question_id == question_id, Response.user_id == user_id)
+            .limit(1)
+        ).first()
         return result is not None
 
 
-def get_first_correct_response(question_id: int) -> Optional[Response]:
+def get_first_correct_response(question_id: int):
+    """Return the earliest correct response, or None.
+
+    Fetches only (user_id, answered_at) — all callers need is the winner's
+    id — so the full ORM row is never materialised.
+    """
+    with _RESP_LOCK:
+        buffered = [
+            row
+            for row in _RESPONSE_BUF
+            if row["question_id"] == question_id and row["is_correct"]
+        ]
     with get_session() as session:
-        result = (
-            session.query(Response)
-            .filter(Response.question_id == question_id, Response.is_correct == 1)
+        result = session.execute(
+            select(Response.user_id, Response.answered_at)
+            .where(Response.question_id == question_id, Response.is_correct == 1)
             .order_by(Response.answered_at.asc())
-            .first()
-        )
-        if result:
-            session.expunge(result)
-        return result
+            .limit(1)
+        ).first()
+    if buffered:
+        earliest = min(buffered, key=lambda row: row["answered_at"])
+        if result is None or earliest["answered_at"] < result.answered_at:
+            return Response(**earliest)
+    return result
 
 
 def get_guild_config(guild_id: int) -> GuildConfig:
+    cached = _GUILD_CONFIG_CACHE.get(guild_id)
+    if cached is not None:
+        return cached
     with get_session() as session:
         config = session.get(GuildConfig, guild_id)
-        if config:
-            session.expunge(config)
-            return config
-        config = GuildConfig(guild_id=guild_id)
-        session.add(config)
-        session.flush()
+        if not config:
+            config = GuildConfig(guild_id=guild_id)
+            session.add(config)
+            session.flush()
         session.expunge(config)
-        return config
+    _GUILD_CONFIG_CACHE[guild_id] = config
+    return config
 
 
 def update_guild_config(guild_id: int, **kwargs) -> GuildConfig:
@@ -551,11 +857,13 @@ def update_guild_config(guild_id: int, **kwargs) -> GuildConfig:
         session.add(config)
         session.flush()
         session.expunge(config)
-        return config
+    _GUILD_CONFIG_CACHE.pop(guild_id, None)
+    return config
 
 
 def get_user_answer_stats(user_id: int) -> Dict[str, object]:
     """Return rich statistics for a user's quiz history."""
+    flush_responses()
     with get_session() as session:
         total_answers = (
             session.query(func.count(Response.id)).filter(Response.user_id == user_id).scalar() or 0
@@ -604,68 +912,76 @@ def get_user_answer_stats(user_id: int) -> Dict[str, object]:
         }
 
 
+def _query_top_topic_performers(session, limit_per_topic: int) -> Dict[str, list]:
+    rows = (
+        session.query(
+            Question.topic.label("topic"),
+            Response.user_id.label("user_id"),
+            func.coalesce(func.sum(Response.is_correct), 0).label("correct"),
+            func.count(Response.id).label("attempts"),
+        )
+        .join(Question, Question.id == Response.question_id)
+        .group_by(Question.topic, Response.user_id)
+        .having(func.coalesce(func.sum(Response.is_correct), 0) > 0)
+        .all()
+    )
+
+    grouped: Dict[str, list] = {}
+    for row in rows:
+        grouped.setdefault(row.topic, []).append(
+            {
+                "user_id": row.user_id,
+                "correct": int(row.correct or 0),
+                "attempts": int(row.attempts or 0),
+                "accuracy": (row.correct / row.attempts) if row.attempts else 0.0,
+            }
+        )
+
+    # sort within each topic by correct answers (desc) then accuracy
+    for topic, entries in grouped.items():
+        entries.sort(key=lambda item: (item["correct"], item["accuracy"]), reverse=True)
+        grouped[topic] = entries[:limit_per_topic]
+
+    return grouped
+
+
 def get_top_topic_performers(limit_per_topic: int = 1) -> Dict[str, list]:
     """Return per-topic top performers based on correct answers."""
     with get_session() as session:
-        rows = (
-            session.query(
-                Question.topic.label("topic"),
-                Response.user_id.label("user_id"),
-                func.coalesce(func.sum(Response.is_correct), 0).label("correct"),
-                func.count(Response.id).label("attempts"),
-            )
-            .join(Question, Question.id == Response.question_id)
-            .group_by(Question.topic, Response.user_id)
-            .having(func.coalesce(func.sum(Response.is_correct), 0) > 0)
-            .all()
-        )
+        return _query_top_topic_performers(session, limit_per_topic)
 
-        grouped: Dict[str, list] = {}
-        for row in rows:
-            grouped.setdefault(row.topic, []).append(
-                {
-                    "user_id": row.user_id,
-                    "correct": int(row.correct or 0),
-                    "attempts": int(row.attempts or 0),
-                    "accuracy": (row.correct / row.attempts) if row.attempts else 0.0,
-                }
-            )
 
-        # sort within each topic by correct answers (desc) then accuracy
-        for topic, entries in grouped.items():
-            entries.sort(key=lambda item: (item["correct"], item["accuracy"]), reverse=True)
-            grouped[topic] = entries[:limit_per_topic]
+def _query_high_accuracy_players(session, limit: int, min_answers: int) -> List[Dict[str, object]]:
+    rows = (
+        session.query(
+            Response.user_id.label("user_id"),
+            func.count(Response.id).label("attempts"),
+            func.coalesce(func.sum(Response.is_correct), 0).label("correct"),
+        )
+        .group_by(Response.user_id)
+        .having(func.count(Response.id) >= min_answers)
+        .all()
+    )
+
+    results: List[Dict[str, object]] = []
+    for row in rows:
+        attempts = int(row.attempts or 0)
+        correct = int(row.correct or 0)
+        accuracy = (correct / attempts) if attempts else 0.0
+        results.append(
+            {
+                "user_id": row.user_id,
+                "attempts": attempts,
+                "correct": correct,
+                "accuracy": accuracy,
+            }
+        )
 
-        return grouped
+    results.sort(key=lambda item: (item["accuracy"], item["correct"]), reverse=True)
+    return results[:limit]
 
 
 def get_high_accuracy_players(limit: int = 5, min_answers: int = 5) -> List[Dict[str, object]]:
     """Return players with the best accuracy given a minimum number of attempts."""
     with get_session() as session:
-        rows = (
-            session.query(
-                Response.user_id.label("user_id"),
-                func.count(Response.id).label("attempts"),
-                func.coalesce(func.sum(Response.is_correct), 0).label("correct"),
-            )
-            .group_by(Response.user_id)
-            .having(func.count(Response.id) >= min_answers)
-            .all()
-        )
-
-        results: List[Dict[str, object]] = []
-        for row in rows:
-            attempts = int(row.attempts or 0)
-            correct = int(row.correct or 0)
-            accuracy = (correct / attempts) if attempts else 0.0
-            results.append(
-                {
-                    "user_id": row.user_id,
-                    "attempts": attempts,
-                    "correct": correct,
-                    "accuracy": accuracy,
-                }
-            )
-
-        results.sort(key=lambda item: (item["accuracy"], item["correct"]), reverse=True)
-        return results[:limit]
+        return _query_high_accuracy_players(session, limit, min_answers)
@@ -1,20 +1,75 @@
 import json
 import logging
+import mmap
 import os
 import random
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import chain
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
-import anthropic
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 try:
-    from openai import OpenAI
+    import msgspec
 except ImportError:
-    OpenAI = None  # type: ignore
+    msgspec = None  # type: ignore
+
+# orjson decodes roughly 5x faster than the stdlib on typical LLM replies;
+# both accept str or bytes here.
+_loads = orjson.loads if orjson is not None else json.loads
+
+if msgspec is not None:
+
+    class _QuestionSchema(msgspec.Struct):
+        """Shape of a generated question; decoded and type-checked in C."""
+
+        question: str
+        options: Dict[str, str]
+        answer: str
+        topic: Optional[str] = None
+        explanation: Optional[str] = None
+        difficulty: Optional[str] = None
+
+    _QUESTION_DECODER = msgspec.json.Decoder(_QuestionSchema)
+else:
+    _QUESTION_DECODER = None
+
+
+def _parse_question(message_content: Union[str, bytes]) -> Dict[str, Any]:
+    """Decode an LLM reply into a question dict.
+
+    With msgspec installed, decoding and field/type validation happen in
+    one C-level pass (ValidationError is a ValueError, so callers' retry
+    handling is unchanged); otherwise this is a plain JSON decode.
+    """
+    if _QUESTION_DECODER is not None:
+        data = message_content.encode() if isinstance(message_content, str) else message_content
+        return msgspec.structs.asdict(_QUESTION_DECODER.decode(data))
+    return _loads(message_content)
 
 LOGGER = logging.getLogger(__name__)
 
+_DEFAULT_SYSTEM_PROMPT = (
+    "You are an expert computer science educator. You create rigorous multiple-choice questions "
+    "with exactly four options labelled A, B, C, D. When a question references or benefits from code, include a concise snippet wrapped in Markdown triple backticks with an appropriate language tag (```python```, ```sql```, etc.). "
+    "Respond with valid JSON following the schema: "
+    '{"topic": "string", "question": "string", "options": {"A": "string", "B": "string", "C": "string", "D": "string"}, '
+    '"answer": "A|B|C|D", "explanation": "string", "difficulty": "Easy|Medium|Hard"}.'
+)
+
+_DEFAULT_USER_TEMPLATE = (
+    "Generate one {difficulty} multiple-choice question about '{topic}'. "
+    "Ensure the problem requires conceptual reasoning or multi-step thinking rather than simple recall. "
+    "If code is necessary to pose the question or clarify the explanation, include it inside triple backticks with a language tag so that Discord can render it correctly."
+)
+
 # Default topics used if topics.json is not found
 DEFAULT_TOPICS = [
     "Algorithms & Data Structures",
@@ -24,8 +79,164 @@ DEFAULT_TOPICS = [
     "Databases & SQL",
 ]
 
+# Valid answer letters, kept as a frozenset for membership tests and for
+# comparing against an options dict's key view.
+_ABCD = frozenset(("A", "B", "C", "D"))
+
+# Difficulty weighting (30% Easy, 50% Medium, 20% Hard) with cumulative
+# weights precomputed so random.choices skips accumulate() per question.
+_DIFFICULTIES = ("Easy", "Medium", "Hard")
+_DIFF_CUM = (30, 80, 100)
+
+# JSON schema describing the question payload. Passed to providers that
+# support structured output so malformed replies are rejected server-side
+# instead of burning a parse retry here. Strict mode requires every
+# property to be listed in "required", so the optional fields are nullable
+# instead of omittable.
+_QUESTION_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topic": {"type": ["string", "null"]},
+        "question": {"type": "string"},
+        "options": {
+            "type": "object",
+            "properties": {
+                "A": {"type": "string"},
+                "B": {"type": "string"},
+                "C": {"type": "string"},
+                "D": {"type": "string"},
+            },
+            "required": ["A", "B", "C", "D"],
+            "additionalProperties": False,
+        },
+        "answer": {"type": "string", "enum": ["A", "B", "C", "D"]},
+        "explanation": {"type": ["string", "null"]},
+        "difficulty": {"type": ["string", "null"]},
+    },
+    "required": ["topic", "question", "options", "answer", "explanation", "difficulty"],
+    "additionalProperties": False,
+}
+
+
+def _read_json_file(path: Path) -> Any:
+    """Parse a JSON file through mmap, handing the page cache straight to the decoder.
+
+    Skips the intermediate bytes copy a plain read() would allocate. Empty
+    files raise ValueError like any other malformed document.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return _loads(view if orjson is not None else view.tobytes())
+            finally:
+                view.release()
+
+
+@lru_cache(maxsize=1)
+def _load_config_cached() -> Dict:
+    """Load LLM configuration from models.json file.
+
+    Cached at module level so repeated LLMClient construction reuses the
+    parsed dict instead of re-reading and re-decoding the file; call
+    LLMClient.reload_config() after editing models.json.
+
+    Returns:
+        Dictionary containing provider and settings configuration.
+        Returns empty dict if file not found (uses defaults).
+    """
+    config_path = Path(__file__).parent.parent / "models.json"
+
+    if not config_path.exists():
+        LOGGER.warning("models.json not found at %s, using default configuration", config_path)
+        return {}
+
+    try:
+        config = _read_json_file(config_path)
+        LOGGER.info("Loaded LLM configuration from models.json")
+        return config
+    except (ValueError, IOError) as exc:
+        LOGGER.error("Failed to load models.json: %s. Using default configuration.", exc)
+        return {}
+
+
+@lru_cache(maxsize=1)
+def _load_topics_cached() -> List[str]:
+    """Load quiz topics from topics.json file.
+
+    Cached like _load_config_cached; LLMClient.reload_config() clears it
+    after the admin topic commands rewrite topics.json.
+
+    Returns:
+        List of topic strings from all enabled categories.
+        Returns DEFAULT_TOPICS if file not found or error occurs.
+    """
+    topics_path = Path(__file__).parent.parent / "topics.json"
+
+    if not topics_path.exists():
+        LOGGER.warning("topics.json not found at %s, using default topics", topics_path)
+        return DEFAULT_TOPICS
+
+    try:
+        topics_config = _read_json_file(topics_path)
+        categories = topics_config.get("categories", {})
+
+        all_topics = list(
+            chain.from_iterable(
+                category_data.get("topics", [])
+                for category_data in categories.values()
+                if category_data.get("enabled", True)
+            )
+        )
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            for category_name, category_data in categories.items():
+                if category_data.get("enabled", True):
+                    LOGGER.debug("Loaded %d topics from category '%s'",
+                                len(category_data.get("topics", [])), category_name)
+
+        if not all_topics:
+            LOGGER.warning("No topics found in topics.json, using defaults")
+            return DEFAULT_TOPICS
+
+        LOGGER.info("Loaded %d topics from topics.json", len(all_topics))
+        return all_topics
+
+    except (ValueError, IOError) as exc:
+        LOGGER.error("Failed to load topics.json: %s. Using default topics.", exc)
+        return DEFAULT_TOPICS
+
+
+@lru_cache(maxsize=8)
+def _get_sdk_client(provider_name: str, api_key: str) -> Optional[Any]:
+    """Construct (or reuse) the SDK client for a provider/key pair.
 
-@dataclass
+    Each SDK client owns an httpx connection pool, so caching here lets
+    repeated LLMClient construction share pools instead of re-running
+    TCP/TLS handshakes. SDK imports are deferred to this point so that
+    importing the module never pays for providers that are not configured.
+    Returns None for unusable providers.
+    """
+    if provider_name == "openai":
+        try:
+            from openai import OpenAI
+        except ImportError:
+            LOGGER.error("OpenAI library not installed. Run: pip install openai")
+            return None
+        return OpenAI(api_key=api_key)
+    if provider_name in ("anthropic", "claude"):
+        try:
+            import anthropic
+        except ImportError:
+            LOGGER.error("Anthropic library not installed. Run: pip install anthropic")
+            return None
+        return anthropic.Anthropic(api_key=api_key)
+    LOGGER.warning("Unknown provider '%s', skipping", provider_name)
+    return None
+
+
+@dataclass(slots=True, frozen=True)
 class QuestionPayload:
     topic: str
     question: str
@@ -36,13 +247,172 @@ class QuestionPayload:
     model_name: str = "unknown"
 
 
-@dataclass
-class StoredQuestion:
-    topic: str
-    prompt: str
-    options: Dict[str, str]
-    answer: str
-    explanation: Optional[str]
+# In-process cache of recently generated questions, bucketed by
+# (topic, difficulty). generate_question occasionally serves from here
+# instead of paying for an API round-trip, and appends every fresh
+# question to a JSONL file so the cache survives restarts.
+_QUESTION_CACHE_PATH = Path("data") / "question_cache.jsonl"
+_QUESTION_CACHE_BUCKET = 5
+
+_question_cache: Dict[Tuple[str, str], deque] = {}
+_question_cache_loaded = False
+
+# Reused msgspec codec instances for cache rows; encoder output buffers are
+# reused across calls, so appending a row never re-serialises the cache.
+if msgspec is not None:
+    _CACHE_ENCODER = msgspec.json.Encoder()
+    _CACHE_DECODER = msgspec.json.Decoder()
+else:
+    _CACHE_ENCODER = None
+    _CACHE_DECODER = None
+
+
+def _encode_cache_row(row: Dict[str, Any]) -> bytes:
+    if _CACHE_ENCODER is not None:
+        return _CACHE_ENCODER.encode(row)
+    if orjson is not None:
+        return orjson.dumps(row)
+    return json.dumps(row).encode()
+
+
+def _decode_cache_row(line: bytes) -> Dict[str, Any]:
+    if _CACHE_DECODER is not None:
+        return _CACHE_DECODER.decode(line)
+    return _loads(line)
+
+
+def _ensure_question_cache_loaded() -> None:
+    """Rebuild the question cache from its JSONL file on first use."""
+    global _question_cache_loaded
+    if _question_cache_loaded:
+        return
+    _question_cache_loaded = True
+    if not _QUESTION_CACHE_PATH.exists():
+        return
+    try:
+        with open(_QUESTION_CACHE_PATH, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = _decode_cache_row(line)
+                payload = QuestionPayload(**row["payload"])
+                bucket = _question_cache.setdefault(
+                    (row["topic"], row["difficulty"]),
+                    deque(maxlen=_QUESTION_CACHE_BUCKET),
+                )
+                bucket.append(payload)
+    except (ValueError, OSError, TypeError, KeyError) as exc:
+        LOGGER.warning("Could not load question cache: %s", exc)
+        return
+    LOGGER.info("Loaded question cache with %d buckets", len(_question_cache))
+
+
+def _store_cached_question(topic: str, difficulty: str, payload: "QuestionPayload") -> None:
+    """Add a freshly generated question to the cache and persist it."""
+    bucket = _question_cache.setdefault(
+        (topic, difficulty), deque(maxlen=_QUESTION_CACHE_BUCKET)
+    )
+    bucket.append(payload)
+    row = {"topic": topic, "difficulty": difficulty, "payload": asdict(payload)}
+    try:
+        data = _encode_cache_row(row)
+        _QUESTION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(_QUESTION_CACHE_PATH, "ab") as f:
+            f.write(data + b"\n")
+    except OSError as exc:
+        LOGGER.warning("Could not persist question cache: %s", exc)
+
+
+# Curated fallback questions, built once; _fallback_question used to
+# reconstruct all five payloads on every outage.
+_FALLBACK_QUESTIONS: Dict[str, QuestionPayload] = {
+    "Operating Systems": QuestionPayload(
+        topic="Operating Systems",
+        question="Which of the following scheduling algorithms is preemptive by design?",
+        options={
+            "A": "First-Come, First-Served (FCFS)",
+            "B": "Shortest Job First (SJF)",
+            "C": "Round Robin",
+            "D": "Non-preemptive Priority",
+        },
+        answer="C",
+        explanation="Round Robin uses time slices, forcing a context switch once the quantum expires.",
+        difficulty="Medium",
+        model_name="fallback",
+    ),
+    "Algorithms & Data Structures": QuestionPayload(
+        topic="Algorithms & Data Structures",
+        question="What is the time complexity of inserting an element into a max-heap of size n?",
+        options={
+            "A": "O(1)",
+            "B": "O(log n)",
+            "C": "O(n)",
+            "D": "O(n log n)",
+        },
+        answer="B",
+        explanation="Heap insertion bubbles the value up at most log n levels.",
+        difficulty="Medium",
+        model_name="fallback",
+    ),
+    "Databases & SQL": QuestionPayload(
+        topic="Databases & SQL",
+        question="In SQL, which isolation level prevents dirty reads but allows phantom reads?",
+        options={
+            "A": "Read Uncommitted",
+            "B": "Read Committed",
+            "C": "Repeatable Read",
+            "D": "Serializable",
+        },
+        answer="B",
+        explanation="Read Committed prevents dirty reads but still allows phantom reads and non-repeatable reads.",
+        difficulty="Medium",
+        model_name="fallback",
+    ),
+    "Computer Networking": QuestionPayload(
+        topic="Computer Networking",
+        question="Which layer of the OSI model is responsible for end-to-end communication and error recovery?",
+        options={
+            "A": "Network Layer",
+            "B": "Transport Layer",
+            "C": "Session Layer",
+            "D": "Data Link Layer",
+        },
+        answer="B",
+        explanation="The Transport Layer (Layer 4) provides end-to-end communication services including error recovery and flow control.",
+        difficulty="Medium",
+        model_name="fallback",
+    ),
+    "Machine Learning": QuestionPayload(
+        topic="Machine Learning",
+        question="Which technique helps prevent overfitting by randomly dropping neurons during training?",
+        options={
+            "A": "Batch Normalization",
+            "B": "Dropout",
+            "C": "Early Stopping",
+            "D": "Data Augmentation",
+        },
+        answer="B",
+        explanation="Dropout randomly disables neurons during training, forcing the network to learn redundant representations and preventing overfitting.",
+        difficulty="Medium",
+        model_name="fallback",
+    ),
+}
+
+_GENERIC_FALLBACK = QuestionPayload(
+    topic="Computer Science",
+    question="Which Big-O complexity class represents logarithmic time?",
+    options={
+        "A": "O(1)",
+        "B": "O(n)",
+        "C": "O(log n)",
+        "D": "O(n^2)",
+    },
+    answer="C",
+    explanation="Logarithmic time grows slowly, often observed in balanced divide-and-conquer algorithms.",
+    difficulty="Medium",
+    model_name="fallback",
+)
 
 
 class ProviderAdapter:
@@ -96,8 +466,25 @@ class OpenAIResponsesAdapter(ProviderAdapter):
             request["reasoning"] = params.pop("reasoning")
         if "temperature" in params:
             request["temperature"] = params.pop("temperature")
-        if "response_format" in params:
-            request["response_format"] = params.pop("response_format")
+        # Structured output lives under text.format in the Responses API;
+        # response_format is the Chat Completions spelling and the SDK
+        # rejects it as an unknown kwarg, so a configured value is dropped.
+        if params.pop("response_format", None) is not None:
+            LOGGER.warning(
+                "Ignoring response_format for model '%s'; configure text.format instead.",
+                model_name,
+            )
+        text_format = params.pop("text", None)
+        if text_format is None:
+            text_format = {
+                "format": {
+                    "type": "json_schema",
+                    "name": "quiz_question",
+                    "schema": _QUESTION_JSON_SCHEMA,
+                    "strict": True,
+                }
+            }
+        request["text"] = text_format
 
         request.update(params)
         return request
@@ -185,6 +572,9 @@ class LLMClient:
         self.config = self._load_config()
         self.settings = self.config.get("settings", {})
         self.prompts = self.config.get("prompts", {})
+        # Resolved once so the per-question path skips the dict lookups
+        self._system_prompt = self.prompts.get("system", _DEFAULT_SYSTEM_PROMPT)
+        self._user_template = self.prompts.get("user_template", _DEFAULT_USER_TEMPLATE)
 
         # Load topics from topics.json
         self.available_topics = self._load_topics()
@@ -193,9 +583,16 @@ class LLMClient:
         self.model_specs = self._get_model_specs()
         self.available_models = [spec["name"] for spec in self.model_specs]
         self._model_index = {spec["name"]: spec for spec in self.model_specs}
+        providers = self.config.get("providers", {})
+        self._model_to_provider: Dict[str, Tuple[str, Dict]] = {
+            spec["name"]: (spec["provider"], providers.get(spec["provider"], {}))
+            for spec in self.model_specs
+        }
 
         self.model = model or random.choice(self.available_models if self.available_models else self.AVAILABLE_MODELS)
         self.timeout = self.settings.get("timeout", timeout)
+        self._max_retries = self.settings.get("max_retries", 3)
+        self._cache_hit_rate = self.settings.get("cache_hit_rate", 0.3)
 
         # Initialize clients for all enabled providers
         self._clients: Dict[str, Any] = {}
@@ -207,66 +604,16 @@ class LLMClient:
             "claude": AnthropicMessagesAdapter(),
         }
 
-    @staticmethod
-    def _load_config() -> Dict:
-        """Load LLM configuration from models.json file.
-
-        Returns:
-            Dictionary containing provider and settings configuration.
-            Returns empty dict if file not found (uses defaults).
-        """
-        config_path = Path(__file__).parent.parent / "models.json"
-
-        if not config_path.exists():
-            LOGGER.warning("models.json not found at %s, using default configuration", config_path)
-            return {}
-
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                config = json.load(f)
-                LOGGER.info("Loaded LLM configuration from models.json")
-                return config
-        except (json.JSONDecodeError, IOError) as exc:
-            LOGGER.error("Failed to load models.json: %s. Using default configuration.", exc)
-            return {}
-
-    @staticmethod
-    def _load_topics() -> List[str]:
-        """Load quiz topics from topics.json file.
+    # Cached module-level loaders; kept as attributes so existing
+    # self._load_config()/self._load_topics() call sites are unchanged.
+    _load_config = staticmethod(_load_config_cached)
+    _load_topics = staticmethod(_load_topics_cached)
 
-        Returns:
-            List of topic strings from all enabled categories.
-            Returns DEFAULT_TOPICS if file not found or error occurs.
-        """
-        topics_path = Path(__file__).parent.parent / "topics.json"
-
-        if not topics_path.exists():
-            LOGGER.warning("topics.json not found at %s, using default topics", topics_path)
-            return DEFAULT_TOPICS
-
-        try:
-            with open(topics_path, "r", encoding="utf-8") as f:
-                topics_config = json.load(f)
-                categories = topics_config.get("categories", {})
-
-                all_topics = []
-                for category_name, category_data in categories.items():
-                    if category_data.get("enabled", True):
-                        category_topics = category_data.get("topics", [])
-                        all_topics.extend(category_topics)
-                        LOGGER.debug("Loaded %d topics from category '%s'",
-                                    len(category_topics), category_name)
-
-                if not all_topics:
-                    LOGGER.warning("No topics found in topics.json, using defaults")
-                    return DEFAULT_TOPICS
-
-                LOGGER.info("Loaded %d topics from topics.json", len(all_topics))
-                return all_topics
-
-        except (json.JSONDecodeError, IOError) as exc:
-            LOGGER.error("Failed to load topics.json: %s. Using default topics.", exc)
-            return DEFAULT_TOPICS
+    @classmethod
+    def reload_config(cls) -> None:
+        """Forget the cached models.json/topics.json so the next load re-reads disk."""
+        _load_config_cached.cache_clear()
+        _load_topics_cached.cache_clear()
 
     def _get_model_specs(self) -> List[Dict[str, Any]]:
         """Extract model specs from all enabled providers.
@@ -331,14 +678,7 @@ class LLMClient:
         Returns:
             Tuple of (provider_name, provider_config) or None if not found.
         """
-        model_spec = self._model_index.get(model_name)
-        if not model_spec:
-            return None
-
-        provider_name = model_spec["provider"]
-        providers = self.config.get("providers", {})
-        provider_config = providers.get(provider_name, {})
-        return (provider_name, provider_config)
+        return self._model_to_provider.get(model_name)
 
     def _initialize_provider_clients(self) -> None:
         """Initialize API clients for all enabled providers.
@@ -364,29 +704,19 @@ class LLMClient:
                              provider_name, api_key_env)
                 continue
 
-            # Initialize the appropriate client based on provider name
+            # Fetch the (cached) client for this provider/key pair
             try:
-                if provider_name == "openai":
-                    if OpenAI is None:
-                        LOGGER.error("OpenAI library not installed. Run: pip install openai")
-                        continue
-                    client = OpenAI(api_key=api_key)
-                    self._clients[provider_name] = client
-                    LOGGER.info("Initialized OpenAI client successfully")
-
-                elif provider_name in ("anthropic", "claude"):
-                    client = anthropic.Anthropic(api_key=api_key)
-                    self._clients[provider_name] = client
-                    LOGGER.info("Initialized Anthropic client successfully")
-
-                else:
-                    LOGGER.warning("Unknown provider '%s', skipping", provider_name)
-                    continue
-
+                client = _get_sdk_client(provider_name, api_key)
             except Exception as exc:
                 LOGGER.error("Failed to initialize %s client: %s", provider_name, exc)
                 continue
 
+            if client is None:
+                continue
+
+            self._clients[provider_name] = client
+            LOGGER.info("Initialized %s client successfully", provider_name)
+
         if not self._clients:
             LOGGER.warning("No LLM provider clients initialized. Bot will use fallback questions.")
 
@@ -443,12 +773,19 @@ class LLMClient:
         else:
             self.available_topics = self._load_topics()
             chosen_topic = random.choice(self.available_topics)
-        # Weighted random selection: 50% Easy, 30% Medium, 20% Hard
-        target_difficulty = random.choices(
-            ["Easy", "Medium", "Hard"],
-            weights=[30, 50, 20],
-            k=1
-        )[0]
+        # Weighted random selection: 30% Easy, 50% Medium, 20% Hard
+        target_difficulty = random.choices(_DIFFICULTIES, cum_weights=_DIFF_CUM, k=1)[0]
+
+        # Occasionally serve a recently generated question from the local
+        # cache; the probability gate keeps most rounds fresh.
+        _ensure_question_cache_loaded()
+        bucket = _question_cache.get((chosen_topic, target_difficulty))
+        if bucket and random.random() < self._cache_hit_rate:
+            cached = random.choice(bucket)
+            self.model = cached.model_name
+            LOGGER.info("Serving cached question for topic '%s' (%s)",
+                       chosen_topic, target_difficulty)
+            return cached
 
         if not self._clients:
             LOGGER.warning("No LLM clients available; using local fallback question.")
@@ -456,281 +793,194 @@ class LLMClient:
             self.model = fallback.model_name
             return fallback
 
-        # Prepare models to try - shuffle for variety, limit to max_retries
+        # Prepare models to try - sample max_retries without copying and
+        # shuffling the whole list
+        max_retries = self._max_retries
+        if model and model not in self.available_models:
+            LOGGER.warning("Requested model '%s' not found in available models.", model)
+            model = None
         if model:
-            if model in self.available_models:
-                fallback_models = [m for m in self.available_models if m != model]
-                random.shuffle(fallback_models)
-                models_to_try = [model] + fallback_models
-            else:
-                LOGGER.warning("Requested model '%s' not found in available models.", model)
-                models_to_try = self.available_models[:]
-                random.shuffle(models_to_try)
+            others = [m for m in self.available_models if m != model]
+            models_to_try = [model] + random.sample(others, k=min(max_retries - 1, len(others)))
         else:
-            models_to_try = self.available_models[:]
-            random.shuffle(models_to_try)
-
-        max_retries = self.settings.get("max_retries", 3)
-        models_to_try = models_to_try[:max_retries]
-
-        # Get prompts from config or use defaults
-        system_prompt = self.prompts.get(
-            "system",
-            "You are an expert computer science educator. You create rigorous multiple-choice questions "
-            "with exactly four options labelled A, B, C, D. When a question references or benefits from code, include a concise snippet wrapped in Markdown triple backticks with an appropriate language tag (```python```, ```sql```, etc.). "
-            "Respond with valid JSON following the schema: "
-            '{"topic": "string", "question": "string", "options": {"A": "string", "B": "string", "C": "string", "D": "string"}, '
-            '"answer": "A|B|C|D", "explanation": "string", "difficulty": "Easy|Medium|Hard"}.'
-        )
-
-        user_prompt_template = self.prompts.get(
-            "user_template",
-            "Generate one {difficulty} multiple-choice question about '{topic}'. "
-            "Ensure the problem requires conceptual reasoning or multi-step thinking rather than simple recall. "
-            "If code is necessary to pose the question or clarify the explanation, include it inside triple backticks with a language tag so that Discord can render it correctly."
-        )
+            models_to_try = random.sample(
+                self.available_models, k=min(max_retries, len(self.available_models))
+            )
 
-        user_prompt = user_prompt_template.format(
+        system_prompt = self._system_prompt
+        user_prompt = self._user_template.format(
             difficulty=target_difficulty.lower(),
             topic=chosen_topic
         )
 
-        failed_models = []
-
-        for attempt_num, model_choice in enumerate(models_to_try, start=1):
-            LOGGER.info("Attempt %d/%d: Trying model '%s' for topic '%s'",
-                       attempt_num, max_retries, model_choice, chosen_topic)
-
-            # Get the appropriate client for this model
-            provider_name, client = self._get_client_and_provider_for_model(model_choice)
-            if not client:
-                LOGGER.warning("Attempt %d/%d: No client available for model '%s'",
-                             attempt_num, max_retries, model_choice)
-                failed_models.append((model_choice, "No client available"))
-                continue
-
-            adapter = self._adapters.get(provider_name)
-            if not adapter:
-                LOGGER.warning("Attempt %d/%d: No adapter for provider '%s'",
-                              attempt_num, max_retries, provider_name)
-                failed_models.append((model_choice, f"No adapter for provider '{provider_name}'"))
-                continue
+        failed_models: List[Tuple[str, str]] = []
 
-            provider_config = self.config.get("providers", {}).get(provider_name, {})
-            provider_params = provider_config.get("default_params", {}) or {}
-            model_params = self._get_model_params(model_choice)
-
-            parsed = None
-            parse_retries = 3
-            for parse_try in range(1, parse_retries + 1):
-                try:
-                    request = adapter.build_request(
-                        model_name=model_choice,
-                        system_prompt=system_prompt,
-                        user_prompt=user_prompt,
-                        settings=self.settings,
-                        provider_params=provider_params,
-                        model_params=model_params,
-                    )
-                    response = adapter.send(client, request)
-                except Exception as exc:  # pragma: no cover - network/API failure
-                    LOGGER.warning("Attempt %d/%d (call %d/%d): Model '%s' API call failed: %s",
-                                  attempt_num, max_retries, parse_try, parse_retries, model_choice, str(exc))
-                    failed_models.append((model_choice, f"API error: {str(exc)}"))
-                    parsed = None
-                    break
-
-                try:
-                    message_content = adapter.extract_text(response)
-                    if isinstance(message_content, dict):
-                        parsed = message_content
-                    else:
-                        parsed = json.loads(message_content)
-                    break
-                except (IndexError, KeyError, ValueError, TypeError) as exc:
-                    LOGGER.warning(
-                        "Attempt %d/%d (parse %d/%d): Model '%s' returned unparseable response: %s",
-                        attempt_num,
-                        max_retries,
-                        parse_try,
-                        parse_retries,
+        # A pinned model (guild default or explicit request) must win when it
+        # works, so it gets a solo attempt before anything else races; this
+        # also keeps the common pinned round at a single API call.
+        if model:
+            payload = self._attempt_model(
+                model, system_prompt, user_prompt, chosen_topic,
+                target_difficulty, failed_models,
+            )
+            if payload is not None:
+                self.model = payload.model_name
+                _store_cached_question(chosen_topic, target_difficulty, payload)
+                return payload
+            models_to_try = models_to_try[1:]
+
+        # Fire the remaining candidates concurrently and take the first
+        # payload that validates. Remote round-trips dominate the latency
+        # here, so this turns a chain of failed attempts into max(latency)
+        # instead of sum(latency); losers are cancelled or ignored.
+        if models_to_try:
+            LOGGER.info("Trying %d models concurrently for topic '%s': %s",
+                       len(models_to_try), chosen_topic, models_to_try)
+            pool = ThreadPoolExecutor(max_workers=len(models_to_try))
+            try:
+                futures = [
+                    pool.submit(
+                        self._attempt_model,
                         model_choice,
-                        str(exc),
+                        system_prompt,
+                        user_prompt,
+                        chosen_topic,
+                        target_difficulty,
+                        failed_models,
                     )
-                    parsed = None
-
-            if parsed is None:
-                failed_models.append((model_choice, "Parse error: exceeded retries"))
-                continue
-
-            # Validate response structure
-            options = parsed.get("options", {})
-            if not options or len(options) != 4:
-                LOGGER.warning("Attempt %d/%d: Model '%s' returned invalid options count: %d",
-                              attempt_num, max_retries, model_choice, len(options))
-                failed_models.append((model_choice, f"Invalid options: expected 4, got {len(options)}"))
-                continue
-
-            answer = parsed.get("answer", "").strip().upper()
-            if answer not in ("A", "B", "C", "D"):
-                LOGGER.warning("Attempt %d/%d: Model '%s' returned invalid answer: %s",
-                              attempt_num, max_retries, model_choice, answer)
-                failed_models.append((model_choice, f"Invalid answer: {answer}"))
-                continue
-
-            # Success! Return the validated question
-            question_text = parsed.get("question", "No question returned.")
-            self.model = model_choice
-            LOGGER.info("Successfully generated question using model '%s' on attempt %d/%d",
-                       model_choice, attempt_num, max_retries)
-            return QuestionPayload(
-                topic=parsed.get("topic", chosen_topic),
-                question=question_text,
-                options={opt.upper(): text for opt, text in options.items()},
-                answer=answer,
-                explanation=parsed.get("explanation"),
-                difficulty=parsed.get("difficulty", target_difficulty),
-                model_name=model_choice,
-            )
+                    for model_choice in models_to_try
+                ]
+                for future in as_completed(futures):
+                    payload = future.result()
+                    if payload is None:
+                        continue
+                    self.model = payload.model_name
+                    _store_cached_question(chosen_topic, target_difficulty, payload)
+                    return payload
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
 
-        # All retries exhausted, use fallback
+        # All attempts exhausted, use fallback
         LOGGER.error("All %d model attempts failed. Failed models: %s. Using fallback question.",
-                    max_retries, failed_models)
+                    len(failed_models), failed_models)
         fallback = self._fallback_question(chosen_topic)
         self.model = fallback.model_name
         return fallback
 
-    def _reuse_stored_question(self, topic: str) -> Optional[QuestionPayload]:
-        """Try to reuse a recent stored question from the database."""
-        try:
-            from services import db
-        except Exception as exc:  # pragma: no cover - optional dependency
-            LOGGER.warning("Database module not available: %s", exc)
+    def _attempt_model(
+        self,
+        model_choice: str,
+        system_prompt: str,
+        user_prompt: str,
+        chosen_topic: str,
+        target_difficulty: str,
+        failed_models: List[Tuple[str, str]],
+    ) -> Optional[QuestionPayload]:
+        """Run one model attempt end to end and return a validated payload or None.
+
+        Failures are recorded in ``failed_models`` (list.append is safe from
+        the worker threads generate_question runs these on).
+        """
+        provider_name, client = self._get_client_and_provider_for_model(model_choice)
+        if not client:
+            LOGGER.warning("No client available for model '%s'", model_choice)
+            failed_models.append((model_choice, "No client available"))
             return None
 
-        try:
-            recent = db.fetch_recent_questions(limit=25)
-        except Exception as exc:  # pragma: no cover - db failure
-            LOGGER.warning("Failed to fetch stored questions: %s", exc)
+        adapter = self._adapters.get(provider_name)
+        if not adapter:
+            LOGGER.warning("No adapter for provider '%s'", provider_name)
+            failed_models.append((model_choice, f"No adapter for provider '{provider_name}'"))
             return None
 
-        if not recent:
+        provider_config = self.config.get("providers", {}).get(provider_name, {})
+        provider_params = provider_config.get("default_params", {}) or {}
+        model_params = self._get_model_params(model_choice)
+
+        parsed = None
+        parse_retries = 3
+        for parse_try in range(1, parse_retries + 1):
+            try:
+                request = adapter.build_request(
+                    model_name=model_choice,
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    settings=self.settings,
+                    provider_params=provider_params,
+                    model_params=model_params,
+                )
+                response = adapter.send(client, request)
+            except Exception as exc:  # pragma: no cover - network/API failure
+                LOGGER.warning("Model '%s' API call failed (call %d/%d): %s",
+                              model_choice, parse_try, parse_retries, str(exc))
+                failed_models.append((model_choice, f"API error: {str(exc)}"))
+                return None
+
+            try:
+                message_content = adapter.extract_text(response)
+                if isinstance(message_content, dict):
+                    parsed = message_content
+                else:
+                    parsed = _parse_question(message_content)
+                break
+            except (IndexError, KeyError, ValueError, TypeError) as exc:
+                LOGGER.warning(
+                    "Model '%s' returned unparseable response (parse %d/%d): %s",
+                    model_choice,
+                    parse_try,
+                    parse_retries,
+                    str(exc),
+                )
+                parsed = None
+
+        if parsed is None:
+            failed_models.append((model_choice, "Parse error: exceeded retries"))
             return None
 
-        candidates = [q for q in recent if q.get("topic") == topic]
-        pool = candidates if candidates else recent
-        choice = random.choice(pool)
+        # Validate response structure
+        options = parsed.get("options", {})
+        if not options or len(options) != 4:
+            LOGGER.warning("Model '%s' returned invalid options count: %d",
+                          model_choice, len(options))
+            failed_models.append((model_choice, f"Invalid options: expected 4, got {len(options)}"))
+            return None
 
-        try:
-            return QuestionPayload(
-                topic=choice.get("topic", topic),
-                question=choice.get("prompt", "No question stored."),
-                options=choice.get("options", {}),
-                answer=choice.get("correct_answer", "").strip().upper(),
-                explanation=choice.get("explanation"),
-                difficulty=None,
-                model_name="stored",
-            )
-        except Exception as exc:  # pragma: no cover
-            LOGGER.warning("Stored question malformed: %s", exc)
+        answer = parsed.get("answer", "").strip().upper()
+        if answer not in _ABCD:
+            LOGGER.warning("Model '%s' returned invalid answer: %s", model_choice, answer)
+            failed_models.append((model_choice, f"Invalid answer: {answer}"))
             return None
 
+        # Models almost always return uppercase A-D keys; only rebuild the
+        # dict when they do not.
+        if options.keys() != _ABCD:
+            options = {opt.upper(): text for opt, text in options.items()}
+
+        LOGGER.info("Successfully generated question using model '%s'", model_choice)
+        # Strict-schema replies carry explicit nulls for the optional
+        # fields, so fall back on falsiness rather than key absence.
+        return QuestionPayload(
+            topic=parsed.get("topic") or chosen_topic,
+            question=parsed.get("question") or "No question returned.",
+            options=options,
+            answer=answer,
+            explanation=parsed.get("explanation"),
+            difficulty=parsed.get("difficulty") or target_difficulty,
+            model_name=model_choice,
+        )
+
     @staticmethod
     def _fallback_question(topic: str) -> QuestionPayload:
         """Return a curated fallback question when all LLM attempts fail.
 
         This ensures the bot always has quality questions to serve even during API outages.
         """
-        sample_questions = {
-            "Operating Systems": QuestionPayload(
-                topic="Operating Systems",
-                question="Which of the following scheduling algorithms is preemptive by design?",
-                options={
-                    "A": "First-Come, First-Served (FCFS)",
-                    "B": "Shortest Job First (SJF)",
-                    "C": "Round Robin",
-                    "D": "Non-preemptive Priority",
-                },
-                answer="C",
-                explanation="Round Robin uses time slices, forcing a context switch once the quantum expires.",
-                difficulty="Medium",
-                model_name="fallback",
-            ),
-            "Algorithms & Data Structures": QuestionPayload(
-                topic="Algorithms & Data Structures",
-                question="What is the time complexity of inserting an element into a max-heap of size n?",
-                options={
-                    "A": "O(1)",
-                    "B": "O(log n)",
-                    "C": "O(n)",
-                    "D": "O(n log n)",
-                },
-                answer="B",
-                explanation="Heap insertion bubbles the value up at most log n levels.",
-                difficulty="Medium",
-                model_name="fallback",
-            ),
-            "Databases & SQL": QuestionPayload(
-                topic="Databases & SQL",
-                question="In SQL, which isolation level prevents dirty reads but allows phantom reads?",
-                options={
-                    "A": "Read Uncommitted",
-                    "B": "Read Committed",
-                    "C": "Repeatable Read",
-                    "D": "Serializable",
-                },
-                answer="B",
-                explanation="Read Committed prevents dirty reads but still allows phantom reads and non-repeatable reads.",
-                difficulty="Medium",
-                model_name="fallback",
-            ),
-            "Computer Networking": QuestionPayload(
-                topic="Computer Networking",
-                question="Which layer of the OSI model is responsible for end-to-end communication and error recovery?",
-                options={
-                    "A": "Network Layer",
-                    "B": "Transport Layer",
-                    "C": "Session Layer",
-                    "D": "Data Link Layer",
-                },
-                answer="B",
-                explanation="The Transport Layer (Layer 4) provides end-to-end communication services including error recovery and flow control.",
-                difficulty="Medium",
-                model_name="fallback",
-            ),
-            "Machine Learning": QuestionPayload(
-                topic="Machine Learning",
-                question="Which technique helps prevent overfitting by randomly dropping neurons during training?",
-                options={
-                    "A": "Batch Normalization",
-                    "B": "Dropout",
-                    "C": "Early Stopping",
-                    "D": "Data Augmentation",
-                },
-                answer="B",
-                explanation="Dropout randomly disables neurons during training, forcing the network to learn redundant representations and preventing overfitting.",
-                difficulty="Medium",
-                model_name="fallback",
-            ),
-        }
-
-        if topic in sample_questions:
+        payload = _FALLBACK_QUESTIONS.get(topic)
+        if payload is not None:
             LOGGER.info("Using curated fallback question for topic: %s", topic)
-            return sample_questions[topic]
+            return payload
 
-        # Default fallback when topic not in curated sample list
+        # Default fallback when topic not in curated sample list; the
+        # payload still carries the requested topic so stats stay accurate.
         LOGGER.info("Using generic fallback question for topic: %s", topic)
-        return QuestionPayload(
-            topic=topic,
-            question="Which Big-O complexity class represents logarithmic time?",
-            options={
-                "A": "O(1)",
-                "B": "O(n)",
-                "C": "O(log n)",
-                "D": "O(n^2)",
-            },
-            answer="C",
-            explanation="Logarithmic time grows slowly, often observed in balanced divide-and-conquer algorithms.",
-            difficulty="Medium",
-            model_name="fallback",
-        )
+        return replace(_GENERIC_FALLBACK, topic=topic)
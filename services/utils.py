@@ -1,5 +1,6 @@
 import logging
 import os
+from itertools import islice
 from typing import Dict, Iterable
 
 from dotenv import load_dotenv
@@ -7,13 +8,25 @@ from dotenv import load_dotenv
 LOGGER = logging.getLogger(__name__)
 
 
+# mtime of each .env file already parsed; repeated load_environment calls
+# cost one stat() unless the file changed.
+_ENV_MTIME_CACHE: Dict[str, float] = {}
+
+
 def load_environment(dotenv_path: str = ".env") -> None:
     """Load environment variables from a .env file if present."""
-    if os.path.exists(dotenv_path):
-        load_dotenv(dotenv_path)
-        LOGGER.info("Environment variables loaded from %s", dotenv_path)
-    else:
+    try:
+        mtime = os.stat(dotenv_path).st_mtime
+    except OSError:
         LOGGER.info(".env file not found at %s; relying on process environment.", dotenv_path)
+        return
+
+    if _ENV_MTIME_CACHE.get(dotenv_path) == mtime:
+        return
+
+    load_dotenv(dotenv_path)
+    _ENV_MTIME_CACHE[dotenv_path] = mtime
+    LOGGER.info("Environment variables loaded from %s", dotenv_path)
 
 
 def format_options(options: Dict[str, str]) -> str:
@@ -22,31 +35,41 @@ def format_options(options: Dict[str, str]) -> str:
     return "\n".join(lines)
 
 
+# Every common answer token, precomputed so normalise_answer is a single
+# dict lookup for the typical case instead of a chain of predicates.
+_LETTERS = ("A", "B", "C", "D")
+_TOKEN_MAP: Dict[str, str] = {}
+for _index, _letter in enumerate(_LETTERS, start=1):
+    _TOKEN_MAP[_letter] = _letter
+    _TOKEN_MAP[str(_index)] = _letter
+    for _suffix in (")", ".", " ", "-"):
+        _TOKEN_MAP[_letter + _suffix] = _letter
+    _TOKEN_MAP[f"OPTION {_letter}"] = _letter
+    _TOKEN_MAP[f"CHOICE {_letter}"] = _letter
+    _TOKEN_MAP[f"OPTION {_index}"] = _letter
+    _TOKEN_MAP[f"CHOICE {_index}"] = _letter
+
+
 def normalise_answer(answer: str) -> str:
     """Convert user supplied answer tokens into canonical A/B/C/D format."""
     token = answer.strip().upper()
-    if token in ("A", "B", "C", "D"):
-        return token
-    if len(token) > 1 and token[0] in ("A", "B", "C", "D"):
+    mapped = _TOKEN_MAP.get(token)
+    if mapped is not None:
+        return mapped
+    # Longer inputs ("A) Round Robin", "OPTION B extra text") still need
+    # the prefix checks the map cannot enumerate.
+    if len(token) > 1 and token[0] in _LETTERS:
         if token[1] in {")", ".", " ", "-"}:
             return token[0]
     if token.startswith("OPTION "):
         token = token.replace("OPTION ", "")
     if token.startswith("CHOICE "):
         token = token.replace("CHOICE ", "")
-    if token in ("1", "2", "3", "4"):
-        # map numeric to letter
-        return chr(ord("A") + int(token) - 1)
-    return token
+    return _TOKEN_MAP.get(token, token)
 
 
 def chunk(iterable: Iterable, size: int):
     """Yield successive chunks from an iterable."""
-    chunk_buffer = []
-    for item in iterable:
-        chunk_buffer.append(item)
-        if len(chunk_buffer) == size:
-            yield chunk_buffer
-            chunk_buffer = []
-    if chunk_buffer:
-        yield chunk_buffer
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch